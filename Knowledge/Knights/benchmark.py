@@ -0,0 +1,254 @@
+"""
+Benchmarks for the Knights model checking methods.
+
+Times `model_check` with each method, best of three runs, on every
+query of the `puzzle.py` knowledge bases and on random knowledge bases
+of growing size, skipping exponential methods on large ones, and
+checks that all methods give the same answers, also on many small
+random queries.
+
+Usage: python benchmark.py [symbols ...]
+"""
+
+import os
+import random
+import sys
+import time
+
+import puzzle
+from knowledge import KnowledgeBase
+from logic import (And, Biconditional, Implication, Not, Or, Symbol,
+                   hashcons, model_check)
+
+METHODS = ["enumerate", "shared", "compiled", "parallel", "sat", "resolution"]
+try:
+    import numpy
+except ImportError:
+    print("NumPy is not installed, skipping the vectorized method")
+else:
+    METHODS.insert(4, "vectorized")
+
+# Most symbols each exponential method is run on
+LIMITS = {"enumerate": 16, "shared": 16, "compiled": 20, "parallel": 24,
+          "vectorized": 24, "resolution": 50}
+
+
+def random_sentence(symbols, depth, rng):
+    """
+    Returns a random sentence over `symbols` with connectives
+    nested at most `depth` deep.
+    """
+    if depth == 0 or rng.random() < 0.2:
+        return rng.choice(symbols)
+    kind = rng.choice([Not, And, Or, Implication, Biconditional])
+    if kind is Not:
+        return Not(random_sentence(symbols, depth - 1, rng))
+    if kind in (And, Or):
+        return kind(*(random_sentence(symbols, depth - 1, rng)
+                      for _ in range(rng.randint(2, 3))))
+    return kind(random_sentence(symbols, depth - 1, rng),
+                random_sentence(symbols, depth - 1, rng))
+
+
+def random_knowledge(n, rng, conjuncts=None, planted=True):
+    """
+    Returns (knowledge, symbols) for a random knowledge base over
+    `n` symbols, a conjunction of small random sentences. If `planted`,
+    only sentences true in one random model are kept, so that the
+    knowledge base is satisfiable.
+    """
+    symbols = [Symbol(f"P{i}") for i in range(n)]
+    model = {symbol.name: rng.random() < 0.5 for symbol in symbols}
+    sentences = []
+    while len(sentences) < (conjuncts or n):
+        sentence = random_sentence(symbols, 2, rng)
+        if not planted or sentence.evaluate(model):
+            sentences.append(sentence)
+    return And(*sentences), symbols
+
+
+def parts(sentence):
+    """
+    Returns the immediate subsentences of `sentence`.
+    """
+    if isinstance(sentence, Not):
+        return [sentence.operand]
+    if isinstance(sentence, And):
+        return sentence.conjuncts
+    if isinstance(sentence, Or):
+        return sentence.disjuncts
+    if isinstance(sentence, Implication):
+        return [sentence.antecedent, sentence.consequent]
+    if isinstance(sentence, Biconditional):
+        return [sentence.left, sentence.right]
+    return []
+
+
+def count_nodes(sentence):
+    """
+    Returns the number of nodes in `sentence` as a tree.
+    """
+    return 1 + sum(count_nodes(part) for part in parts(sentence))
+
+
+def count_objects(sentence, seen=None):
+    """
+    Returns the number of distinct objects among the nodes of `sentence`.
+    """
+    seen = set() if seen is None else seen
+    if id(sentence) in seen:
+        return 0
+    seen.add(id(sentence))
+    return 1 + sum(count_objects(part, seen) for part in parts(sentence))
+
+
+def chain_knowledge(n):
+    """
+    Returns (knowledge, symbols) for a chain of implications over `n`
+    symbols, from a first symbol that is known to be true.
+    """
+    symbols = [Symbol(f"P{i}") for i in range(n)]
+    knowledge = And(symbols[0], *(Implication(symbols[i], symbols[i + 1])
+                                  for i in range(n - 1)))
+    return knowledge, symbols
+
+
+def repeated_knowledge(n, rng):
+    """
+    Returns (knowledge, symbols) for a knowledge base over `n` symbols
+    tying each symbol to separately built copies of one larger random
+    sentence, which interning turns back into one.
+    """
+    symbols = [Symbol(f"P{i}") for i in range(n)]
+    seed = rng.random()
+    knowledge = And(*(
+        Biconditional(symbol,
+                      random_sentence(symbols, 4, random.Random(seed)))
+        for symbol in symbols
+    ))
+    return knowledge, symbols
+
+
+def measure_interning(name, knowledge, symbols, repeat=1000):
+    """
+    Reports the node counts of `knowledge` before and after interning,
+    and how long hashing it and collecting its symbols take.
+    """
+    interned = hashcons(knowledge)
+    timings = []
+    for sentence in (knowledge, interned):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            hash(sentence)
+            sentence.symbols()
+        timings.append((time.perf_counter() - start) / repeat)
+    print(f"  {name:>11}: {count_nodes(knowledge)} nodes, "
+          f"{count_objects(knowledge)} objects, "
+          f"{count_objects(interned)} interned; hash and symbols "
+          f"{1e6 * timings[0]:.1f} us, interned {1e6 * timings[1]:.1f} us")
+    report(name, run(knowledge, symbols, ["enumerate", "shared"]))
+
+
+def run(knowledge, symbols, methods, repeat=3):
+    """
+    Answers every symbol as a query with each method, `repeat` times.
+    Returns a dictionary of method to (answers, seconds), keeping the
+    fastest time, so that one-off setup such as compiling is excluded.
+    """
+    results = {}
+    for method in methods:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            answers = [model_check(knowledge, symbol, method=method)
+                       for symbol in symbols]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[method] = (answers, best)
+    return results
+
+
+def run_knowledge_base(knowledge, symbols, repeat=3):
+    """
+    Answers every symbol as a query against a KnowledgeBase built with
+    each of its methods. Returns results as `run` does.
+    """
+    results = {}
+    for method in ("models", "sat"):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            kb = KnowledgeBase(knowledge, method=method)
+            answers = [kb.entails(symbol) for symbol in symbols]
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[f"kb {method}"] = (answers, best)
+    return results
+
+
+def report(name, results):
+    answers = {tuple(answers) for answers, _ in results.values()}
+    if len(answers) != 1:
+        sys.exit(f"Methods disagree on {name}")
+    times = ", ".join(f"{method} {1000 * elapsed:9.2f} ms"
+                      for method, (_, elapsed) in results.items())
+    print(f"  {name:>11}: {times}")
+
+
+def main():
+    sizes = [int(n) for n in sys.argv[1:]] or [8, 12, 16, 20, 50, 100]
+    symbols = [puzzle.AKnight, puzzle.AKnave, puzzle.BKnight,
+               puzzle.BKnave, puzzle.CKnight, puzzle.CKnave]
+
+    print("Puzzles, every symbol queried")
+    for i, knowledge in enumerate([puzzle.knowledge0, puzzle.knowledge1,
+                                   puzzle.knowledge2, puzzle.knowledge3]):
+        results = run(knowledge, symbols, METHODS)
+        results.update(run_knowledge_base(knowledge, symbols))
+        report(f"puzzle {i}", results)
+
+    print("Interning")
+    rng = random.Random(0)
+    measure_interning("puzzle 3", puzzle.knowledge3, symbols)
+    measure_interning("repeated", *repeated_knowledge(10, rng))
+
+    print(f"Random knowledge bases, every symbol queried, "
+          f"{os.cpu_count()} CPUs")
+    for n in sizes:
+        knowledge, symbols = random_knowledge(n, rng)
+        methods = [method for method in METHODS
+                   if n <= LIMITS.get(method, n)]
+        results = run(knowledge, symbols, methods)
+        if n <= LIMITS["compiled"]:
+            results.update(run_knowledge_base(knowledge, symbols))
+        report(f"{n} symbols", results)
+
+    print("Implication chains, every symbol queried")
+    for n in [50, 200]:
+        knowledge, symbols = chain_knowledge(n)
+        report(f"{n} symbols", run(knowledge, symbols, ["sat", "resolution"]))
+
+    cross_check(rng)
+
+
+def cross_check(rng, formulas=2000):
+    """
+    Checks that every method agrees with enumeration on random
+    queries against small random knowledge bases.
+    """
+    for _ in range(formulas):
+        knowledge, symbols = random_knowledge(
+            rng.randint(1, 8), rng, conjuncts=rng.randint(1, 6),
+            planted=rng.random() < 0.5
+        )
+        query = random_sentence(symbols, 2, rng)
+        answers = {method: model_check(knowledge, query, method=method)
+                   for method in METHODS}
+        if len(set(answers.values())) != 1:
+            sys.exit(f"Methods disagree on {knowledge.formula()} "
+                     f"entailing {query.formula()}: {answers}")
+    print(f"Cross-checked {formulas} random queries.")
+
+
+if __name__ == "__main__":
+    main()
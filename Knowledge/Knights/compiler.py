@@ -0,0 +1,115 @@
+"""
+Compiles logical sentences into Python functions over bitmask models.
+
+A model over symbols s_0, ..., s_{n-1} is the integer whose bit i is
+set if s_i is true, so sweeping every model is a loop over
+range(2 ** n). Sentences become expressions over those bits, compiled
+once, instead of object trees walked recursively for every model.
+"""
+
+from functools import lru_cache
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+def symbol_order(*sentences):
+    """
+    Returns the sorted names of the symbols in `sentences`,
+    giving each its bit position.
+    """
+    return sorted(set().union(*(sentence.symbols()
+                                for sentence in sentences)))
+
+
+def expression(sentence, bits):
+    """
+    Returns Python source for `sentence` as an expression over the
+    model `m`, given a mapping of symbol names to bit positions.
+    Its value is truthy exactly when the sentence holds.
+    """
+    if isinstance(sentence, Symbol):
+        return f"(m >> {bits[sentence.name]} & 1)"
+    if isinstance(sentence, Not):
+        return f"(not {expression(sentence.operand, bits)})"
+    if isinstance(sentence, And):
+        if not sentence.conjuncts:
+            return "True"
+        return "(" + " and ".join(expression(conjunct, bits)
+                                  for conjunct in sentence.conjuncts) + ")"
+    if isinstance(sentence, Or):
+        if not sentence.disjuncts:
+            return "False"
+        return "(" + " or ".join(expression(disjunct, bits)
+                                 for disjunct in sentence.disjuncts) + ")"
+    if isinstance(sentence, Implication):
+        return (f"(not {expression(sentence.antecedent, bits)} "
+                f"or {expression(sentence.consequent, bits)})")
+    if isinstance(sentence, Biconditional):
+        return (f"(not {expression(sentence.left, bits)} "
+                f"== (not {expression(sentence.right, bits)}))")
+    raise TypeError(f"cannot compile {type(sentence).__name__}")
+
+
+def compile_sentence(sentence, symbols=None):
+    """
+    Returns a function mapping a bitmask model to whether `sentence`
+    holds in it, with bit i standing for the symbol named symbols[i]
+    (by default the sentence's symbols in sorted order).
+    """
+    if symbols is None:
+        symbols = symbol_order(sentence)
+    bits = {name: i for i, name in enumerate(symbols)}
+    return define(f"def evaluate(m):\n"
+                  f"    return bool({expression(sentence, bits)})\n")
+
+
+def compile_check(knowledge, query, symbols):
+    """
+    Returns a function that takes a range of bitmask models and
+    returns the first model in which `knowledge` holds but `query`
+    does not, or None if there is none.
+    """
+    bits = {name: i for i, name in enumerate(symbols)}
+    source = (
+        "def check(models):\n"
+        "    for m in models:\n"
+        f"        if {expression(knowledge, bits)} "
+        f"and not {expression(query, bits)}:\n"
+        "            return m\n"
+        "    return None\n"
+    )
+    return define(source)
+
+
+def compile_filter(sentence, symbols):
+    """
+    Returns a function that takes an iterable of bitmask models and
+    returns the list of those in which `sentence` holds.
+    """
+    bits = {name: i for i, name in enumerate(symbols)}
+    return define(f"def select(models):\n"
+                  f"    return [m for m in models "
+                  f"if {expression(sentence, bits)}]\n")
+
+
+@lru_cache(maxsize=256)
+def define(source):
+    """
+    Returns the function defined by `source`, compiling each distinct
+    source only once, since compiling costs more than sweeping the
+    models of a small knowledge base.
+    """
+    namespace = {}
+    exec(source, namespace)
+    name = source[len("def "):source.index("(")]
+    return namespace[name]
+
+
+def model_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, by compiling both and
+    sweeping every model of their symbols.
+    """
+    symbols = symbol_order(knowledge, query)
+    check = compile_check(knowledge, query, symbols)
+    return check(range(2 ** len(symbols))) is None
@@ -0,0 +1,120 @@
+"""
+Knowledge bases that answer many entailment queries from one cache.
+
+`model_check` enumerates every model afresh for each query. A
+`KnowledgeBase` instead keeps the models of its sentences, or a SAT
+solver loaded with them, answers queries against that, remembers the
+answers, and narrows the cache in place when a sentence is added.
+"""
+
+from compiler import compile_check, compile_filter
+from logic import And, Sentence
+from sat import Encoder, Solver
+
+
+class KnowledgeBase():
+    """
+    Conjunction of sentences with cached entailment queries.
+
+    With method "models", the satisfying models are kept as bitmasks
+    over `symbols`, in the order the symbols were first seen. With
+    method "sat", a SAT solver keeps the sentences' clauses and the
+    clauses it learns across queries.
+    """
+
+    def __init__(self, *sentences, method="models"):
+        if method == "models":
+            self.symbols = []
+            self.bits = {}
+            self.models = [0]
+        elif method == "sat":
+            self.solver = Solver()
+            self.encoder = Encoder(self.solver)
+        else:
+            raise ValueError(f"unknown knowledge base method {method}")
+        self.method = method
+        self.sentences = []
+        self.answers = {}
+        for sentence in sentences:
+            self.add(sentence)
+
+    def add(self, sentence):
+        """
+        Adds `sentence` to the knowledge base.
+        """
+        Sentence.validate(sentence)
+        self.sentences.append(sentence)
+
+        # Knowing more never retracts an entailment, but may add some
+        self.answers = {query: answer
+                        for query, answer in self.answers.items() if answer}
+
+        if self.method == "sat":
+            self.encoder.add(sentence)
+        else:
+            self.narrow(sentence)
+
+    def narrow(self, sentence):
+        """
+        Keeps only the models satisfying `sentence`, one conjunct at a
+        time, so the models stay few while new symbols multiply them.
+        """
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.narrow(conjunct)
+            return
+        self.extend(sentence.symbols())
+        self.models = compile_filter(sentence, self.symbols)(self.models)
+
+    def extend(self, names):
+        """
+        Adds symbols to the models, each taking both values in every
+        model so far.
+        """
+        for name in sorted(names):
+            if name in self.bits:
+                continue
+            bit = 1 << len(self.symbols)
+            self.models += [model | bit for model in self.models]
+            self.bits[name] = len(self.symbols)
+            self.symbols.append(name)
+
+    def knowledge(self):
+        """
+        Returns the conjunction of the sentences added so far.
+        """
+        return And(*self.sentences)
+
+    def satisfiable(self):
+        """
+        Returns True if some model satisfies every sentence.
+        """
+        if self.method == "sat":
+            return self.solver.solve()
+        return bool(self.models)
+
+    def entails(self, query):
+        """
+        Checks if the knowledge base entails `query`.
+        """
+        key = repr(query)
+        if key not in self.answers:
+            self.answers[key] = self.check(query)
+        return self.answers[key]
+
+    def check(self, query):
+        if self.method == "sat":
+            return not self.solver.solve([-self.encoder.literal(query)])
+
+        # The query must hold for either value of symbols the knowledge
+        # base does not mention, without storing models over them
+        extra = sorted(query.symbols() - self.bits.keys())
+        width = len(self.symbols)
+        if extra:
+            models = (model | assignment << width
+                      for model in self.models
+                      for assignment in range(2 ** len(extra)))
+        else:
+            models = self.models
+        check = compile_check(And(), query, self.symbols + extra)
+        return check(models) is None
@@ -1,8 +1,14 @@
 import itertools
+import weakref
 
 
 class Sentence():
 
+    # Set on sentences made by `hashcons`, which may be shared between
+    # many parents and so must not change; they cache their hash in
+    # `cached_hash` and their symbols in `cached_symbols`
+    interned = False
+
     def evaluate(self, model):
         """Evaluates the logical sentence."""
         raise Exception("nothing to evaluate")
@@ -78,6 +84,8 @@ class Not(Sentence):
         return isinstance(other, Not) and self.operand == other.operand
 
     def __hash__(self):
+        if self.interned:
+            return self.cached_hash
         return hash(("not", hash(self.operand)))
 
     def __repr__(self):
@@ -90,6 +98,8 @@ class Not(Sentence):
         return "¬" + Sentence.parenthesize(self.operand.formula())
 
     def symbols(self):
+        if self.interned:
+            return set(self.cached_symbols)
         return self.operand.symbols()
 
 
@@ -103,6 +113,8 @@ class And(Sentence):
         return isinstance(other, And) and self.conjuncts == other.conjuncts
 
     def __hash__(self):
+        if self.interned:
+            return self.cached_hash
         return hash(
             ("and", tuple(hash(conjunct) for conjunct in self.conjuncts))
         )
@@ -114,6 +126,8 @@ class And(Sentence):
         return f"And({conjunctions})"
 
     def add(self, conjunct):
+        if self.interned:
+            raise TypeError("cannot add to an interned sentence")
         Sentence.validate(conjunct)
         self.conjuncts.append(conjunct)
 
@@ -127,6 +141,8 @@ class And(Sentence):
                            for conjunct in self.conjuncts])
 
     def symbols(self):
+        if self.interned:
+            return set(self.cached_symbols)
         return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
 
 
@@ -140,6 +156,8 @@ class Or(Sentence):
         return isinstance(other, Or) and self.disjuncts == other.disjuncts
 
     def __hash__(self):
+        if self.interned:
+            return self.cached_hash
         return hash(
             ("or", tuple(hash(disjunct) for disjunct in self.disjuncts))
         )
@@ -158,6 +176,8 @@ class Or(Sentence):
                             for disjunct in self.disjuncts])
 
     def symbols(self):
+        if self.interned:
+            return set(self.cached_symbols)
         return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
 
 
@@ -174,6 +194,8 @@ class Implication(Sentence):
                 and self.consequent == other.consequent)
 
     def __hash__(self):
+        if self.interned:
+            return self.cached_hash
         return hash(("implies", hash(self.antecedent), hash(self.consequent)))
 
     def __repr__(self):
@@ -189,6 +211,8 @@ class Implication(Sentence):
         return f"{antecedent} => {consequent}"
 
     def symbols(self):
+        if self.interned:
+            return set(self.cached_symbols)
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
 
@@ -205,6 +229,8 @@ class Biconditional(Sentence):
                 and self.right == other.right)
 
     def __hash__(self):
+        if self.interned:
+            return self.cached_hash
         return hash(("biconditional", hash(self.left), hash(self.right)))
 
     def __repr__(self):
@@ -222,11 +248,155 @@ class Biconditional(Sentence):
         return f"{left} <=> {right}"
 
     def symbols(self):
+        if self.interned:
+            return set(self.cached_symbols)
         return set.union(self.left.symbols(), self.right.symbols())
 
 
-def model_check(knowledge, query):
-    """Checks if knowledge base entails query."""
+# Interned sentences, keyed by their class and the identities of their
+# interned parts; each sentence keeps its parts alive, so the identities
+# stay valid for as long as an entry does
+interned_sentences = weakref.WeakValueDictionary()
+
+
+def subsentences(sentence):
+    """
+    Returns the immediate parts of a logical sentence.
+    """
+    if isinstance(sentence, Symbol):
+        return []
+    if isinstance(sentence, Not):
+        return [sentence.operand]
+    if isinstance(sentence, And):
+        return sentence.conjuncts
+    if isinstance(sentence, Or):
+        return sentence.disjuncts
+    if isinstance(sentence, Implication):
+        return [sentence.antecedent, sentence.consequent]
+    if isinstance(sentence, Biconditional):
+        return [sentence.left, sentence.right]
+    raise TypeError(f"cannot take parts of {type(sentence).__name__}")
+
+
+def hashcons(sentence):
+    """
+    Returns an interned sentence equal to `sentence`, in which
+    structurally equal subsentences are one shared object.
+    """
+    if sentence.interned:
+        return sentence
+    if isinstance(sentence, Symbol):
+        parts = [sentence.name]
+        key = ("symbol", sentence.name)
+    else:
+        parts = [hashcons(part) for part in subsentences(sentence)]
+        key = (type(sentence),) + tuple(id(part) for part in parts)
+
+    node = interned_sentences.get(key)
+    if node is None:
+        node = type(sentence)(*parts)
+
+        # Hashing and collecting symbols only look one level down,
+        # since the parts already cache theirs
+        node.cached_hash = hash(node)
+        node.cached_symbols = frozenset(node.symbols())
+        node.interned = True
+        interned_sentences[key] = node
+    return node
+
+
+def shared_parts(*sentences):
+    """
+    Returns the identities of the subsentences that occur more than
+    once among the interned `sentences` and their parts.
+    """
+    occurrences = {}
+    seen = set()
+    stack = list(sentences)
+    for sentence in sentences:
+        occurrences[id(sentence)] = occurrences.get(id(sentence), 0) + 1
+    while stack:
+        sentence = stack.pop()
+        if id(sentence) in seen:
+            continue
+        seen.add(id(sentence))
+        for part in subsentences(sentence):
+            occurrences[id(part)] = occurrences.get(id(part), 0) + 1
+            stack.append(part)
+    return {key for key, count in occurrences.items() if count > 1}
+
+
+def evaluate_shared(sentence, model, values, shared):
+    """
+    Evaluates the interned logical sentence, recording the value of
+    each subsentence whose identity is in `shared` in `values`, so
+    that it is evaluated once per model.
+    """
+    if isinstance(sentence, Symbol):
+        return sentence.evaluate(model)
+    memoised = id(sentence) in shared
+    if memoised:
+        value = values.get(id(sentence))
+        if value is not None:
+            return value
+    if isinstance(sentence, Not):
+        value = not evaluate_shared(sentence.operand, model, values, shared)
+    elif isinstance(sentence, And):
+        value = all(evaluate_shared(conjunct, model, values, shared)
+                    for conjunct in sentence.conjuncts)
+    elif isinstance(sentence, Or):
+        value = any(evaluate_shared(disjunct, model, values, shared)
+                    for disjunct in sentence.disjuncts)
+    elif isinstance(sentence, Implication):
+        value = (not evaluate_shared(sentence.antecedent, model, values,
+                                     shared)
+                 or evaluate_shared(sentence.consequent, model, values,
+                                    shared))
+    elif isinstance(sentence, Biconditional):
+        value = (evaluate_shared(sentence.left, model, values, shared)
+                 == evaluate_shared(sentence.right, model, values, shared))
+    else:
+        value = sentence.evaluate(model)
+    if memoised:
+        values[id(sentence)] = value
+    return value
+
+
+def model_check(knowledge, query, method="enumerate"):
+    """
+    Checks if knowledge base entails query.
+
+    `method` chooses how: "enumerate" walks the sentences for every
+    model, "compiled" sweeps bitmask models with compiled sentences,
+    "parallel" splits that sweep across a process pool, "vectorized"
+    evaluates chunks of models as NumPy arrays, "sat" searches for a
+    counter-model with a SAT solver, "resolution" refutes the negated
+    query by resolution, and "shared" enumerates like "enumerate" over
+    interned sentences, evaluating each shared subsentence once per
+    model.
+    """
+    if method == "compiled":
+        import compiler
+        return compiler.model_check(knowledge, query)
+    elif method == "parallel":
+        import parallel
+        return parallel.model_check(knowledge, query)
+    elif method == "vectorized":
+        import vectorized
+        return vectorized.model_check(knowledge, query)
+    elif method == "sat":
+        import sat
+        return sat.entails(knowledge, query)
+    elif method == "resolution":
+        import resolution
+        return resolution.entails(knowledge, query)
+    elif method == "shared":
+        knowledge = hashcons(knowledge)
+        query = hashcons(query)
+        shared_ids = shared_parts(knowledge, query)
+    elif method != "enumerate":
+        raise ValueError(f"unknown model checking method {method}")
+    shared = method == "shared"
 
     def check_all(knowledge, query, symbols, model):
         """Checks if knowledge base entails query, given a particular model."""
@@ -235,6 +405,11 @@ def model_check(knowledge, query):
         if not symbols:
 
             # If knowledge base is true in model, then query must also be true
+            if shared:
+                values = {}
+                if evaluate_shared(knowledge, model, values, shared_ids):
+                    return evaluate_shared(query, model, values, shared_ids)
+                return True
             if knowledge.evaluate(model):
                 return query.evaluate(model)
             return True
@@ -0,0 +1,85 @@
+"""
+Parallel model checking over a pool of processes.
+
+The bitmask models of `compiler` split on their highest bits into
+contiguous ranges, each an independent subproblem. Every worker
+compiles the knowledge base and query once, when it starts, then
+sweeps the ranges it is handed in batches. Between batches it checks
+a shared flag, so all workers stop soon after any one of them finds a
+counter-model.
+"""
+
+import multiprocessing
+import os
+
+import compiler
+
+# Models a worker sweeps between checks of the shared flag
+BATCH = 2 ** 16
+
+# Fewest symbols worth starting processes for; smaller problems are
+# checked in this process
+MIN_SYMBOLS = 18
+
+# Ranges handed out per worker, so that workers finishing early can
+# take over the remaining work
+RANGES_PER_WORKER = 4
+
+check = None
+found = None
+
+
+def load_worker(knowledge, query, symbols, event):
+    """
+    Prepares a worker process: compiles the check and keeps the flag
+    that is set once a counter-model is found.
+    """
+    global check, found
+    check = compiler.compile_check(knowledge, query, symbols)
+    found = event
+
+
+def search(bounds):
+    """
+    Returns the first counter-model in the range of models `bounds`,
+    or None if there is none or another worker has found one.
+    """
+    start, stop = bounds
+    for batch in range(start, stop, BATCH):
+        if found.is_set():
+            return None
+        model = check(range(batch, min(batch + BATCH, stop)))
+        if model is not None:
+            found.set()
+            return model
+    return None
+
+
+def model_check(knowledge, query, workers=None):
+    """
+    Checks if knowledge base entails query, sweeping ranges of models
+    across `workers` processes (by default one per CPU).
+    """
+    symbols = compiler.symbol_order(knowledge, query)
+    workers = workers or os.cpu_count()
+    if len(symbols) < MIN_SYMBOLS or workers == 1:
+        return compiler.model_check(knowledge, query)
+
+    total = 2 ** len(symbols)
+    ranges = min(total, workers * RANGES_PER_WORKER)
+    size = -(-total // ranges)
+    tasks = [(start, min(start + size, total))
+             for start in range(0, total, size)]
+
+    # Once the flag is set the remaining ranges return at once, so wait
+    # for them rather than terminate the pool, which can deadlock while
+    # tasks are still being queued
+    entailed = True
+    event = multiprocessing.Event()
+    with multiprocessing.Pool(workers, initializer=load_worker,
+                              initargs=(knowledge, query, symbols,
+                                        event)) as pool:
+        for model in pool.imap_unordered(search, tasks):
+            if model is not None:
+                entailed = False
+    return entailed
@@ -0,0 +1,194 @@
+"""
+Resolution theorem proving for logical sentences.
+
+A knowledge base entails a query when the clauses of the knowledge base
+together with those of the negated query resolve to the empty clause.
+The prover uses the set-of-support strategy: every resolution involves
+at least one clause descended from the negated query, which keeps it
+from saturating the knowledge base on its own. Clauses are stored in an
+index from each literal to the clauses containing it, new clauses that
+an existing clause subsumes are dropped, and existing clauses that a
+new clause subsumes are deleted.
+
+Clauses are frozensets of integer literals as in `sat`, with each
+symbol numbered by first appearance.
+"""
+
+import heapq
+from collections import defaultdict
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+from sat import Solver
+
+
+def cnf(sentence, positive, variables):
+    """
+    Returns the clauses of `sentence` in conjunctive normal form if
+    `positive`, else those of its negation, numbering new symbols in
+    `variables`. Tautological clauses are left out.
+    """
+    if isinstance(sentence, Symbol):
+        if sentence.name not in variables:
+            variables[sentence.name] = len(variables) + 1
+        variable = variables[sentence.name]
+        return [frozenset([variable if positive else -variable])]
+    if isinstance(sentence, Not):
+        return cnf(sentence.operand, not positive, variables)
+    if isinstance(sentence, And):
+        parts = [cnf(conjunct, positive, variables)
+                 for conjunct in sentence.conjuncts]
+        return conjunction(parts) if positive else disjunction(parts)
+    if isinstance(sentence, Or):
+        parts = [cnf(disjunct, positive, variables)
+                 for disjunct in sentence.disjuncts]
+        return disjunction(parts) if positive else conjunction(parts)
+    if isinstance(sentence, Implication):
+        if positive:
+            return disjunction([cnf(sentence.antecedent, False, variables),
+                                cnf(sentence.consequent, True, variables)])
+        return conjunction([cnf(sentence.antecedent, True, variables),
+                            cnf(sentence.consequent, False, variables)])
+    if isinstance(sentence, Biconditional):
+        left = (cnf(sentence.left, True, variables),
+                cnf(sentence.left, False, variables))
+        right = (cnf(sentence.right, True, variables),
+                 cnf(sentence.right, False, variables))
+
+        # a <=> b is (¬a ∨ b) ∧ (a ∨ ¬b), and ¬(a <=> b) is
+        # (a ∨ b) ∧ (¬a ∨ ¬b)
+        if positive:
+            return conjunction([disjunction([left[1], right[0]]),
+                                disjunction([left[0], right[1]])])
+        return conjunction([disjunction([left[0], right[0]]),
+                            disjunction([left[1], right[1]])])
+    raise TypeError(f"cannot convert {type(sentence).__name__}")
+
+
+def conjunction(parts):
+    """
+    Returns the clauses of the conjunction of clause lists.
+    """
+    return [clause for part in parts for clause in part]
+
+
+def disjunction(parts):
+    """
+    Returns the clauses of the disjunction of clause lists, by
+    distributing the disjunction over their clauses.
+    """
+    clauses = [frozenset()]
+    for part in parts:
+        clauses = [left | right for left in clauses for right in part
+                   if not tautology(left | right)]
+    return clauses
+
+
+def tautology(clause):
+    """
+    Returns True if `clause` contains a literal and its negation.
+    """
+    return any(-literal in clause for literal in clause)
+
+
+class ClauseStore():
+    """
+    Set of clauses indexed by literal, kept free of subsumed clauses.
+    """
+
+    def __init__(self):
+        self.clauses = set()
+        self.index = defaultdict(set)
+
+    def subsumed(self, clause):
+        """
+        Returns True if a stored clause is a subset of `clause`.
+        """
+        return any(other <= clause
+                   for literal in clause
+                   for other in self.index[literal])
+
+    def add(self, clause):
+        """
+        Stores `clause`, deleting the clauses it subsumes.
+        Returns the deleted clauses.
+        """
+        rarest = min(clause, key=lambda literal: len(self.index[literal]))
+        deleted = [other for other in self.index[rarest] if clause <= other]
+        for other in deleted:
+            self.remove(other)
+        self.clauses.add(clause)
+        for literal in clause:
+            self.index[literal].add(clause)
+        return deleted
+
+    def remove(self, clause):
+        self.clauses.discard(clause)
+        for literal in clause:
+            self.index[literal].discard(clause)
+
+
+def satisfiable(clauses, variables):
+    """
+    Returns True if some assignment of `variables` satisfies `clauses`.
+    """
+    solver = Solver()
+    for _ in range(len(variables)):
+        solver.new_variable()
+    for clause in clauses:
+        solver.add_clause(list(clause))
+    return solver.solve()
+
+
+def refute(usable, support):
+    """
+    Returns True if the clauses `usable` and `support` resolve to the
+    empty clause, resolving only with a clause from `support` or one
+    of its descendants in every step. This is complete as long as the
+    `usable` clauses on their own are satisfiable.
+    """
+    store = ClauseStore()
+    for clause in sorted(usable, key=len):
+        if not store.subsumed(clause):
+            store.add(clause)
+
+    # Resolve the shortest clauses of the set of support first
+    seen = set(support)
+    queue = [(len(clause), i, clause) for i, clause in enumerate(seen)]
+    heapq.heapify(queue)
+    count = len(queue)
+    while queue:
+        _, _, given = heapq.heappop(queue)
+        if not given:
+            return True
+        if store.subsumed(given):
+            continue
+        store.add(given)
+
+        for literal in given:
+            for other in list(store.index[-literal]):
+                resolvent = (given - {literal}) | (other - {-literal})
+                if resolvent in seen or tautology(resolvent):
+                    continue
+                if not resolvent:
+                    return True
+                seen.add(resolvent)
+                if not store.subsumed(resolvent):
+                    heapq.heappush(queue, (len(resolvent), count, resolvent))
+                    count += 1
+    return False
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, by resolution refutation
+    of the knowledge base and the negated query.
+    """
+    variables = {}
+    usable = set(cnf(knowledge, True, variables))
+    support = set(cnf(query, False, variables))
+
+    # An unsatisfiable knowledge base entails everything, and resolving
+    # from the set of support alone could fail to show it
+    if not satisfiable(usable, variables):
+        return True
+    return refute(usable, support)
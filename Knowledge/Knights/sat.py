@@ -0,0 +1,391 @@
+"""
+SAT-based entailment for logical sentences.
+
+Sentences are converted to conjunctive normal form by the Tseitin
+encoding, which gives each compound subsentence a fresh variable so the
+clauses grow linearly with the sentence. A conflict-driven clause
+learning (CDCL) solver with two watched literals per clause then
+decides satisfiability, and a knowledge base entails a query exactly
+when the knowledge base together with the negated query is
+unsatisfiable.
+
+Variables are positive integers and literals are nonzero integers,
+negative for a negated variable, as in the DIMACS format.
+"""
+
+import heapq
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+# Factor by which variable activities decay after each conflict
+DECAY = 0.95
+
+# Conflicts before the first restart, and growth of the interval
+RESTART_FIRST = 100
+RESTART_GROWTH = 1.5
+
+
+class Solver():
+    """
+    CDCL SAT solver over clauses of integer literals.
+    """
+
+    def __init__(self):
+        self.clauses = []
+        self.watches = {}
+
+        # Indexed by variable; index 0 is unused
+        self.values = [None]
+        self.levels = [0]
+        self.reasons = [None]
+        self.phases = [False]
+        self.activity = [0.0]
+
+        self.trail = []
+        self.trail_limits = []
+        self.head = 0
+        self.heap = []
+        self.increment = 1.0
+        self.unsatisfiable = False
+        self.conflicts = 0
+
+    def new_variable(self):
+        """
+        Adds a variable and returns it.
+        """
+        self.values.append(None)
+        self.levels.append(0)
+        self.reasons.append(None)
+        self.phases.append(False)
+        self.activity.append(0.0)
+        variable = len(self.values) - 1
+        self.watches[variable] = []
+        self.watches[-variable] = []
+        heapq.heappush(self.heap, (0.0, variable))
+        return variable
+
+    def value(self, literal):
+        """
+        Returns True or False if `literal` is assigned, else None.
+        """
+        value = self.values[abs(literal)]
+        if value is None or literal > 0:
+            return value
+        return not value
+
+    def add_clause(self, literals):
+        """
+        Adds the disjunction of `literals` to the problem.
+        """
+        self.backtrack(0)
+        clause = []
+        for literal in literals:
+            value = self.value(literal)
+            if value is True or -literal in clause:
+                return
+            if value is None and literal not in clause:
+                clause.append(literal)
+
+        if not clause:
+            self.unsatisfiable = True
+        elif len(clause) == 1:
+            self.assign(clause[0], None)
+        else:
+            self.attach(clause)
+
+    def attach(self, clause):
+        """
+        Stores a clause, watching its first two literals.
+        Returns its index.
+        """
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        self.watches[clause[0]].append(index)
+        self.watches[clause[1]].append(index)
+        return index
+
+    def assign(self, literal, reason):
+        variable = abs(literal)
+        self.values[variable] = literal > 0
+        self.levels[variable] = len(self.trail_limits)
+        self.reasons[variable] = reason
+        self.trail.append(literal)
+
+    def backtrack(self, level):
+        """
+        Undoes every assignment made above decision level `level`.
+        """
+        if len(self.trail_limits) <= level:
+            return
+        start = self.trail_limits[level]
+        for literal in self.trail[start:]:
+            variable = abs(literal)
+            self.phases[variable] = literal > 0
+            self.values[variable] = None
+            self.reasons[variable] = None
+            heapq.heappush(self.heap, (-self.activity[variable], variable))
+        del self.trail[start:]
+        del self.trail_limits[level:]
+        self.head = min(self.head, start)
+
+    def propagate(self):
+        """
+        Assigns every literal implied by unit clauses.
+        Returns the index of a falsified clause, or None.
+        """
+        while self.head < len(self.trail):
+            false = -self.trail[self.head]
+            self.head += 1
+            watching = self.watches[false]
+            kept = []
+            for position, index in enumerate(watching):
+                clause = self.clauses[index]
+                if clause[0] == false:
+                    clause[0], clause[1] = clause[1], false
+                if self.value(clause[0]) is True:
+                    kept.append(index)
+                    continue
+
+                # Look for another literal that is not false to watch
+                for k in range(2, len(clause)):
+                    if self.value(clause[k]) is not False:
+                        clause[1], clause[k] = clause[k], false
+                        self.watches[clause[1]].append(index)
+                        break
+                else:
+                    kept.append(index)
+                    if self.value(clause[0]) is False:
+                        kept.extend(watching[position + 1:])
+                        self.watches[false] = kept
+                        return index
+                    self.assign(clause[0], index)
+            self.watches[false] = kept
+        return None
+
+    def analyze(self, conflict):
+        """
+        Returns (clause, level): the clause learned from a conflict by
+        resolving back to its first unique implication point, with the
+        asserting literal first, and the level to backtrack to.
+        """
+        level = len(self.trail_limits)
+        learned = [None]
+        seen = set()
+        pending = 0
+        literal = None
+        position = len(self.trail) - 1
+        clause = self.clauses[conflict]
+        while True:
+            for other in clause:
+                variable = abs(other)
+                if other == literal or variable in seen:
+                    continue
+                if self.levels[variable] == 0:
+                    continue
+                seen.add(variable)
+                self.bump(variable)
+                if self.levels[variable] == level:
+                    pending += 1
+                else:
+                    learned.append(other)
+
+            # Resolve on the latest assigned literal of this level
+            while abs(self.trail[position]) not in seen:
+                position -= 1
+            literal = self.trail[position]
+            position -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.clauses[self.reasons[abs(literal)]]
+
+        learned[0] = -literal
+        if len(learned) == 1:
+            return learned, 0
+
+        # Watch the literal that is unassigned last when backtracking
+        deepest = max(range(1, len(learned)),
+                      key=lambda i: self.levels[abs(learned[i])])
+        learned[1], learned[deepest] = learned[deepest], learned[1]
+        return learned, self.levels[abs(learned[1])]
+
+    def bump(self, variable):
+        self.activity[variable] += self.increment
+        if self.activity[variable] > 1e100:
+            self.activity = [activity * 1e-100 for activity in self.activity]
+            self.increment *= 1e-100
+            self.heap = [(-self.activity[v], v)
+                         for v in range(1, len(self.values))
+                         if self.values[v] is None]
+            heapq.heapify(self.heap)
+        if self.values[variable] is None:
+            heapq.heappush(self.heap,
+                           (-self.activity[variable], variable))
+
+    def decide(self):
+        """
+        Returns the unassigned variable with the highest activity,
+        or None if every variable is assigned.
+        """
+        while self.heap:
+            _, variable = heapq.heappop(self.heap)
+            if self.values[variable] is None:
+                return variable
+        return None
+
+    def solve(self, assumptions=()):
+        """
+        Returns True if the clauses are satisfiable with every literal
+        in `assumptions` true, leaving a satisfying assignment for
+        `model`, else False. Clauses learned along the way stay valid
+        for later calls with other assumptions.
+        """
+        if self.unsatisfiable:
+            return False
+        self.backtrack(0)
+        restart = RESTART_FIRST
+        conflicts = 0
+        while True:
+            conflict = self.propagate()
+            if conflict is not None:
+                if not self.trail_limits:
+                    self.unsatisfiable = True
+                    return False
+                learned, level = self.analyze(conflict)
+                self.backtrack(level)
+                if len(learned) == 1:
+                    self.assign(learned[0], None)
+                else:
+                    self.assign(learned[0], self.attach(learned))
+                self.increment /= DECAY
+                self.conflicts += 1
+                conflicts += 1
+                if conflicts >= restart:
+                    conflicts = 0
+                    restart *= RESTART_GROWTH
+                    self.backtrack(0)
+                continue
+
+            # Decide the assumptions first, one level each
+            literal = None
+            while len(self.trail_limits) < len(assumptions):
+                assumption = assumptions[len(self.trail_limits)]
+                value = self.value(assumption)
+                if value is False:
+                    return False
+                self.trail_limits.append(len(self.trail))
+                if value is None:
+                    literal = assumption
+                    break
+
+            if literal is None:
+                variable = self.decide()
+                if variable is None:
+                    return True
+                literal = variable if self.phases[variable] else -variable
+                self.trail_limits.append(len(self.trail))
+            self.assign(literal, None)
+
+    def model(self):
+        """
+        Returns the current assignment as a list of true literals.
+        """
+        return [variable if value else -variable
+                for variable, value in enumerate(self.values)
+                if variable and value is not None]
+
+
+class Encoder():
+    """
+    Tseitin encoding of sentences into the clauses of a solver.
+    """
+
+    def __init__(self, solver):
+        self.solver = solver
+        self.variables = {}
+
+        # Literal of each encoded compound sentence, by identity, with
+        # the sentence kept alive so its id is not reused
+        self.literals = {}
+
+    def variable(self, name):
+        """
+        Returns the solver variable of the symbol named `name`.
+        """
+        if name not in self.variables:
+            self.variables[name] = self.solver.new_variable()
+        return self.variables[name]
+
+    def add(self, sentence):
+        """
+        Adds `sentence` to the solver as a constraint that must hold.
+        """
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.solver.add_clause([self.literal(disjunct)
+                                    for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.solver.add_clause([-self.literal(sentence.antecedent),
+                                    self.literal(sentence.consequent)])
+        else:
+            self.solver.add_clause([self.literal(sentence)])
+
+    def literal(self, sentence):
+        """
+        Returns a literal equivalent to `sentence`, adding clauses
+        defining a fresh variable for it if it is compound.
+        """
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+
+        key = id(sentence)
+        if key in self.literals:
+            return self.literals[key][1]
+        if isinstance(sentence, Implication):
+            literal = self.disjunction([-self.literal(sentence.antecedent),
+                                        self.literal(sentence.consequent)])
+        elif isinstance(sentence, Or):
+            literal = self.disjunction([self.literal(disjunct)
+                                        for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, And):
+            literal = -self.disjunction([-self.literal(conjunct)
+                                         for conjunct in sentence.conjuncts])
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            literal = self.solver.new_variable()
+            add = self.solver.add_clause
+            add([-literal, -left, right])
+            add([-literal, left, -right])
+            add([literal, left, right])
+            add([literal, -left, -right])
+        else:
+            raise TypeError(f"cannot encode {type(sentence).__name__}")
+        self.literals[key] = (sentence, literal)
+        return literal
+
+    def disjunction(self, literals):
+        """
+        Returns a fresh variable equivalent to the disjunction of
+        `literals`.
+        """
+        variable = self.solver.new_variable()
+        self.solver.add_clause([-variable] + literals)
+        for literal in literals:
+            self.solver.add_clause([variable, -literal])
+        return variable
+
+
+def entails(knowledge, query):
+    """
+    Checks if knowledge base entails query, by checking that the
+    knowledge base is unsatisfiable when the query is false.
+    """
+    solver = Solver()
+    encoder = Encoder(solver)
+    encoder.add(knowledge)
+    return not solver.solve([-encoder.literal(query)])
@@ -0,0 +1,74 @@
+"""
+Vectorized truth-table evaluation of logical sentences with NumPy.
+
+Models are numbered as in `compiler`, with bit i of model m giving the
+value of the i-th symbol. The models are swept in chunks of
+consecutive numbers: within a chunk each low symbol is a boolean
+column over the chunk's models and each high symbol is a constant, so
+every connective is one array operation per chunk, and memory stays
+bounded by the chunk size however many symbols there are.
+"""
+
+import numpy as np
+
+from compiler import symbol_order
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+# Models per chunk are 2 ** CHUNK_BITS
+CHUNK_BITS = 16
+
+
+def evaluate(sentence, columns, cache):
+    """
+    Returns the truth value of `sentence` across a chunk of models, as
+    a boolean array or a NumPy boolean scalar, given each symbol's
+    values in `columns`. Subsentences shared within the tree are
+    evaluated once per chunk through `cache`.
+    """
+    key = id(sentence)
+    if key in cache:
+        return cache[key]
+    if isinstance(sentence, Symbol):
+        value = columns[sentence.name]
+    elif isinstance(sentence, Not):
+        value = ~evaluate(sentence.operand, columns, cache)
+    elif isinstance(sentence, And):
+        value = np.True_
+        for conjunct in sentence.conjuncts:
+            value = value & evaluate(conjunct, columns, cache)
+    elif isinstance(sentence, Or):
+        value = np.False_
+        for disjunct in sentence.disjuncts:
+            value = value | evaluate(disjunct, columns, cache)
+    elif isinstance(sentence, Implication):
+        value = (~evaluate(sentence.antecedent, columns, cache)
+                 | evaluate(sentence.consequent, columns, cache))
+    elif isinstance(sentence, Biconditional):
+        value = (evaluate(sentence.left, columns, cache)
+                 == evaluate(sentence.right, columns, cache))
+    else:
+        raise TypeError(f"cannot evaluate {type(sentence).__name__}")
+    cache[key] = value
+    return value
+
+
+def model_check(knowledge, query):
+    """
+    Checks if knowledge base entails query, by evaluating both over
+    every model of their symbols, one chunk of models at a time.
+    """
+    symbols = symbol_order(knowledge, query)
+    low = min(len(symbols), CHUNK_BITS)
+    models = np.arange(2 ** low)
+    low_columns = {name: (models >> i & 1).astype(bool)
+                   for i, name in enumerate(symbols[:low])}
+
+    for chunk in range(2 ** (len(symbols) - low)):
+        columns = dict(low_columns)
+        for i, name in enumerate(symbols[low:]):
+            columns[name] = np.bool_(chunk >> i & 1)
+        cache = {}
+        if np.any(evaluate(knowledge, columns, cache)
+                  & ~evaluate(query, columns, cache)):
+            return False
+    return True
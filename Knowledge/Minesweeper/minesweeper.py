@@ -1,5 +1,9 @@
 import itertools
 import random
+from collections import defaultdict, deque
+from fractions import Fraction
+
+import probability
 
 
 class Minesweeper():
@@ -141,11 +145,12 @@ class MinesweeperAI():
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, mines=None):
 
-        # Set initial height and width
+        # Set initial height, width, and number of mines, if known
         self.height = height
         self.width = width
+        self.total_mines = mines
 
         # Keep track of which cells have been clicked on
         self.moves_made = set()
@@ -154,8 +159,51 @@ class MinesweeperAI():
         self.mines = set()
         self.safes = set()
 
-        # List of sentences about the game known to be true
-        self.knowledge = []
+        # Known safe cells not yet clicked on
+        self.safe_moves = set()
+
+        # Sentences about the game known to be true, mapping each
+        # sentence's frozenset of cells to its count of mines
+        self.sentences = {}
+
+        # Maps each cell to the cell sets of the sentences mentioning it
+        self.index = defaultdict(set)
+
+        # Cell sets of sentences to draw inferences from, in order
+        self.worklist = deque()
+
+    @property
+    def knowledge(self):
+        """
+        List of sentences about the game known to be true.
+        """
+        return [Sentence(cells, count)
+                for cells, count in self.sentences.items()]
+
+    def add_sentence(self, cells, count):
+        """
+        Adds a sentence to the knowledge base and queues it for
+        inference, unless it is empty or its cells are already known.
+        """
+        cells = frozenset(cells)
+        if not cells or cells in self.sentences:
+            return
+        self.sentences[cells] = count
+        for cell in cells:
+            self.index[cell].add(cells)
+        self.worklist.append(cells)
+
+    def remove_sentence(self, cells):
+        """
+        Removes a sentence from the knowledge base.
+        Returns its count of mines.
+        """
+        count = self.sentences.pop(cells)
+        for cell in cells:
+            self.index[cell].discard(cells)
+            if not self.index[cell]:
+                del self.index[cell]
+        return count
 
     def mark_mine(self, cell):
         """
@@ -163,8 +211,9 @@ class MinesweeperAI():
         to mark that cell as a mine as well.
         """
         self.mines.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_mine(cell)
+        for cells in list(self.index.get(cell, ())):
+            count = self.remove_sentence(cells)
+            self.add_sentence(cells - {cell}, count - 1)
 
     def mark_safe(self, cell):
         """
@@ -172,8 +221,11 @@ class MinesweeperAI():
         to mark that cell as safe as well.
         """
         self.safes.add(cell)
-        for sentence in self.knowledge:
-            sentence.mark_safe(cell)
+        if cell not in self.moves_made:
+            self.safe_moves.add(cell)
+        for cells in list(self.index.get(cell, ())):
+            count = self.remove_sentence(cells)
+            self.add_sentence(cells - {cell}, count)
 
     def add_knowledge(self, cell, count):
         """
@@ -191,6 +243,7 @@ class MinesweeperAI():
                if they can be inferred from existing knowledge
         """
         self.moves_made.add(cell)
+        self.safe_moves.discard(cell)
         self.mark_safe(cell)
         newcells = set()
         for i in range(cell[0] - 1, cell[0] + 2):
@@ -199,50 +252,52 @@ class MinesweeperAI():
                 # Ignore the cell itself
                 if (i, j) == cell:
                     continue
-                if (i, j) in self.mines or (i, j) in self.safes:
+                if not (0 <= i < self.height and 0 <= j < self.width):
                     continue
-                
-                if 0 <= i < self.height and 0 <= j < self.width:
-                    newcell1 = (i,j)
-                    newcells.add(newcell1)
-        self.knowledge.append(Sentence(newcells, count))
-        new_knowledge_added = True
-        new_sentences = [] + self.knowledge
-        num = len(new_sentences)
-        new_sentences2 = []
-        while new_knowledge_added:
-            new_knowledge_added = False
-            for sentence in self.knowledge:
-                known_mines = set()
-                known_mines = known_mines.union(sentence.known_mines())
-                if len(known_mines) != 0:
-                    #print("d")
-                    for known_mine in known_mines:
-                        self.mark_mine(known_mine)
-                        new_knowledge_added = True
-                known_safes = set()
-                known_safes = known_safes.union(sentence.known_safes())
-                if len(known_safes) != 0:
-                    #print("c")
-                    for known_safe in known_safes:
-                        self.mark_safe(known_safe)
-                        new_knowledge_added = True
-                
-                for i in range(num):
-                    #print("Self:",len(self.knowledge))
-                    #print(len(new_sentences))
-                    #print("b")
-                    if new_sentences[i].cells < sentence.cells and len(new_sentences[i].cells) != 0:
-                        #print("b")
-                        new_sentence = sentence.cells-new_sentences[i].cells
-                        new_sentence_count = sentence.count-new_sentences[i].count
-                        if new_sentence not in new_sentences2:
-                            new_sentences2.append(new_sentence)
-                            self.knowledge.append(Sentence(new_sentence, new_sentence_count))
-                            new_knowledge_added = True
-        #print("a")
-        
 
+                # Known mines are accounted for in the count
+                if (i, j) in self.mines:
+                    count -= 1
+                elif (i, j) not in self.safes:
+                    newcells.add((i, j))
+        self.add_sentence(newcells, count)
+        self.infer()
+
+    def infer(self):
+        """
+        Draws conclusions from the queued sentences until none are
+        left, comparing each only with sentences that share a cell.
+        Marking cells changes the sentences mentioning them, which
+        queues those sentences again.
+        """
+        while self.worklist:
+            cells = self.worklist.popleft()
+            count = self.sentences.get(cells)
+            if count is None:
+                continue
+
+            if count == 0:
+                for cell in cells:
+                    self.mark_safe(cell)
+                continue
+            if count == len(cells):
+                for cell in cells:
+                    self.mark_mine(cell)
+                continue
+
+            # Subtract any sentence whose cells are a subset of another
+            related = set()
+            for cell in cells:
+                related.update(self.index[cell])
+            related.discard(cells)
+            for other in related:
+                other_count = self.sentences.get(other)
+                if other_count is None or cells not in self.sentences:
+                    continue
+                if other < cells:
+                    self.add_sentence(cells - other, count - other_count)
+                elif cells < other:
+                    self.add_sentence(other - cells, other_count - count)
 
     def make_safe_move(self):
         """
@@ -253,7 +308,7 @@ class MinesweeperAI():
         This function may use the knowledge in self.mines, self.safes
         and self.moves_made, but should not modify any of those values.
         """
-        for possible_cell in self.safes:
+        for possible_cell in self.safe_moves:
             if possible_cell not in self.moves_made:
                 if possible_cell not in self.mines:
                     return possible_cell
@@ -263,14 +318,57 @@ class MinesweeperAI():
     def make_random_move(self):
         """
         Returns a move to make on the Minesweeper board.
-        Should choose randomly among cells that:
+        Should choose among cells that:
             1) have not already been chosen, and
             2) are not known to be mines
+        the one least likely to be a mine, at random among equally
+        likely ones.
+
+        Cells found to be certainly safe or certainly mines are marked
+        as such first, and None is returned if only mines are left. The
+        total number of mines is only taken into account if it was given.
         """
-        for i in range(self.height):
-            for j in range(self.width):
-                randomcell = (i,j)
-                if randomcell not in self.moves_made:
-                    if randomcell not in self.mines:
-                        return randomcell
-        return None
+        move = self.make_safe_move()
+        if move is not None:
+            return move
+
+        unconstrained = [
+            (i, j) for i in range(self.height) for j in range(self.width)
+            if (i, j) not in self.moves_made and (i, j) not in self.safes
+            and (i, j) not in self.mines and (i, j) not in self.index
+        ]
+        mines_left = None
+        if self.total_mines is not None:
+            mines_left = self.total_mines - len(self.mines)
+        risks, other = probability.probabilities(
+            self.sentences, self.index, len(unconstrained), mines_left
+        )
+        if other is not None:
+            for cell in unconstrained:
+                risks[cell] = other
+
+        for cell, risk in risks.items():
+            if risk == 0:
+                self.mark_safe(cell)
+            elif risk == 1:
+                self.mark_mine(cell)
+        self.infer()
+
+        # Without the number of mines nothing is known about unconstrained
+        # cells, so guess they are as likely to be mines as frontier cells
+        if other is None:
+            other = (sum(risks.values()) / len(risks) if risks
+                     else Fraction(1, 2))
+            for cell in unconstrained:
+                risks[cell] = other
+        move = self.make_safe_move()
+        if move is not None:
+            return move
+
+        candidates = [(risk, cell) for cell, risk in risks.items()
+                      if cell not in self.mines]
+        if not candidates:
+            return None
+        lowest = min(risk for risk, _ in candidates)
+        return random.choice([cell for risk, cell in candidates
+                              if risk == lowest])
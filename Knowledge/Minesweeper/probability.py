@@ -0,0 +1,212 @@
+"""
+Exact mine probabilities for Minesweeper knowledge.
+
+Cells mentioned by the AI's sentences form the frontier. The sentences
+split it into components that share no cells, and each component is
+solved on its own by backtracking over its cells, counting the mine
+arrangements that satisfy every sentence by the number of mines they
+use. Every other unknown cell is unconstrained, so the arrangements of
+the components combine with the ways of placing the remaining mines
+among those cells, `math.comb(unconstrained, remaining)`, and each cell's
+chance of being a mine is its share of all those arrangements.
+
+The solutions of components are cached by their sentences, so after a
+move only the components it changed are solved again.
+"""
+
+import math
+from fractions import Fraction
+from functools import lru_cache
+
+# Number of component solutions kept between moves
+CACHE_SIZE = 4096
+
+
+def components(sentences, index):
+    """
+    Returns the components of `sentences`, a dict from frozensets of
+    cells to counts of mines, as frozensets of (cells, count) pairs.
+    `index` maps each cell to the cell sets of the sentences mentioning
+    it.
+    """
+    seen = set()
+    result = []
+    for start in sentences:
+        if start in seen:
+            continue
+        seen.add(start)
+        component = [start]
+        for cells in component:
+            for cell in cells:
+                for other in index[cell]:
+                    if other not in seen:
+                        seen.add(other)
+                        component.append(other)
+        result.append(frozenset((cells, sentences[cells])
+                                for cells in component))
+    return result
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def solve(component):
+    """
+    Returns (cells, counts, mine_counts) for a component: its cells,
+    `counts[k]` the number of arrangements of k mines in them that
+    satisfy its sentences, and `mine_counts[i][k]` the number of those
+    in which `cells[i]` is a mine.
+    """
+    constraints = list(component)
+
+    # Order cells so each follows one it shares a sentence with, which
+    # lets sentences be checked as soon as possible
+    by_cell = {}
+    for c, (cells, _) in enumerate(constraints):
+        for cell in cells:
+            by_cell.setdefault(cell, []).append(c)
+    order = []
+    placed = set()
+    for cell in sorted(by_cell):
+        if cell in placed:
+            continue
+        placed.add(cell)
+        order.append(cell)
+        queue = [cell]
+        for current in queue:
+            for c in by_cell[current]:
+                for other in sorted(constraints[c][0]):
+                    if other not in placed:
+                        placed.add(other)
+                        order.append(other)
+                        queue.append(other)
+
+    n = len(order)
+    watched = [by_cell[cell] for cell in order]
+    needed = [count for _, count in constraints]
+    free = [len(cells) for cells, _ in constraints]
+    counts = [0] * (n + 1)
+    mine_counts = [[0] * (n + 1) for _ in range(n)]
+    mines = []
+
+    def update(position, mine, step):
+        """
+        Adds (`step` 1) or removes (`step` -1) a choice for the cell at
+        `position`. Returns False if a sentence can no longer hold.
+        """
+        ok = True
+        for c in watched[position]:
+            free[c] -= step
+            if mine:
+                needed[c] -= step
+            if needed[c] < 0 or needed[c] > free[c]:
+                ok = False
+        return ok
+
+    # stack[i] is whether the cell at position i is a mine, trying each
+    # cell as safe before trying it as a mine
+    stack = []
+    while True:
+        if len(stack) == n:
+            k = len(mines)
+            counts[k] += 1
+            for i in mines:
+                mine_counts[i][k] += 1
+        else:
+            stack.append(False)
+            if update(len(stack) - 1, False, 1):
+                continue
+
+        # Undo choices back to the latest cell not yet tried as a mine
+        while stack:
+            position = len(stack) - 1
+            if stack.pop():
+                update(position, True, -1)
+                mines.pop()
+                continue
+            update(position, False, -1)
+            stack.append(True)
+            mines.append(position)
+            if update(position, True, 1):
+                break
+        else:
+            break
+
+    return (tuple(order), tuple(counts),
+            tuple(tuple(by_mines) for by_mines in mine_counts))
+
+
+def convolve(left, right):
+    """
+    Returns the distribution of total mines of two independent parts,
+    given the number of arrangements of each by its number of mines.
+    """
+    result = [0] * (len(left) + len(right) - 1)
+    for i, a in enumerate(left):
+        if a:
+            for j, b in enumerate(right):
+                result[i + j] += a * b
+    return result
+
+
+def probabilities(sentences, index, unconstrained, mines_left):
+    """
+    Returns (risks, other) for the knowledge in `sentences` and `index`:
+    a dict from each frontier cell to its probability of being a mine,
+    and the probability for each of the `unconstrained` other unknown
+    cells, given that `mines_left` mines remain unknown. Probabilities
+    are exact Fractions, so certainties compare equal to 0 or 1.
+
+    If `mines_left` is None, or no arrangement uses exactly that many
+    mines, the number of mines is ignored: every arrangement of the
+    frontier counts equally, and `other` is None since nothing is known
+    about the unconstrained cells.
+    """
+    solutions = [solve(component)
+                 for component in components(sentences, index)]
+
+    # Distributions of the components before and after each one, so
+    # that the others of each component take one convolution
+    prefixes = [[1]]
+    for _, counts, _ in solutions:
+        prefixes.append(convolve(prefixes[-1], counts))
+    suffixes = [[1]]
+    for _, counts, _ in reversed(solutions):
+        suffixes.append(convolve(suffixes[-1], counts))
+    suffixes.reverse()
+    others = [convolve(prefixes[i], suffixes[i + 1])
+              for i in range(len(solutions))]
+    total_counts = prefixes[-1]
+
+    # weights[k] counts the placements of the mines left over among the
+    # unconstrained cells when the frontier holds k of them
+    counted = False
+    if mines_left is not None:
+        weights = [math.comb(unconstrained, mines_left - k)
+                   if k <= mines_left else 0
+                   for k in range(len(total_counts))]
+        total = sum(count * weight
+                    for count, weight in zip(total_counts, weights))
+        counted = total > 0
+    if not counted:
+        weights = [1] * len(total_counts)
+        total = sum(total_counts)
+
+    risks = {}
+    for (cells, _, mine_counts), other in zip(solutions, others):
+
+        # Arrangements of everything else given k mines in this component
+        rest = [sum(count * weights[k + j] for j, count in enumerate(other))
+                for k in range(len(cells) + 1)]
+        for cell, by_mines in zip(cells, mine_counts):
+            risks[cell] = Fraction(sum(count * rest[k]
+                                       for k, count in enumerate(by_mines)),
+                                   total)
+
+    if not counted:
+        return risks, None
+    other = Fraction(0)
+    if unconstrained:
+        other = min(1, Fraction(sum(count * weights[k] * (mines_left - k)
+                                    for k, count in enumerate(total_counts)
+                                    if k <= mines_left),
+                                total * unconstrained))
+    return risks, other
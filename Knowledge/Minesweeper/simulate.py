@@ -0,0 +1,173 @@
+"""
+Headless batch simulation of the Minesweeper AI.
+
+Plays a number of seeded games of each board size across a pool of
+processes, and writes each size's win rate, guesses per game and
+per-move latency percentiles as JSON. A move's latency covers choosing
+the move and adding the revealed count to the AI's knowledge.
+
+Sizes are preset names, or HEIGHTxWIDTHxMINES such as 20x20x60, given
+as a comma-separated list. The presets are beginner (9x9, 10 mines),
+intermediate (16x16, 40 mines), expert (16x30, 99 mines) and large
+(100x100 at expert density, 2000 mines).
+
+Usage: python simulate.py [games] [output] [workers] [sizes]
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+from minesweeper import Minesweeper, MinesweeperAI
+
+# Board sizes as (height, width, mines)
+PRESETS = {
+    "beginner": (9, 9, 10),
+    "intermediate": (16, 16, 40),
+    "expert": (16, 30, 99),
+    "large": (100, 100, 2000)
+}
+
+# Latency percentiles to report
+PERCENTILES = [50, 90, 99]
+
+
+def main():
+    if len(sys.argv) > 5:
+        sys.exit("Usage: python simulate.py "
+                 "[games] [output] [workers] [sizes]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    output = sys.argv[2] if len(sys.argv) > 2 else "simulation.json"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    names = sys.argv[4].split(",") if len(sys.argv) > 4 else list(PRESETS)
+    try:
+        sizes = {name: parse_size(name) for name in names}
+    except ValueError as e:
+        sys.exit(str(e))
+
+    start = time.perf_counter()
+    results = run_simulation(sizes, games, workers)
+    results["seconds"] = time.perf_counter() - start
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for name, stats in results["sizes"].items():
+        latency = stats["latency_ms"]
+        print(f"{name:>12}: won {stats['wins']:5d}/{stats['games']:<5d} "
+              f"({100 * stats['win_rate']:5.1f}%), "
+              f"{stats['guesses_per_game']:5.2f} guesses/game, "
+              f"p50 {latency['p50']:8.3f} ms, p99 {latency['p99']:8.3f} ms")
+    print(f"Results written to {output}.")
+
+
+def parse_size(name):
+    """
+    Returns (height, width, mines) for a preset name or a
+    HEIGHTxWIDTHxMINES string.
+    Raises ValueError if `name` is neither.
+    """
+    if name in PRESETS:
+        return PRESETS[name]
+    try:
+        height, width, mines = (int(part) for part in name.split("x"))
+    except ValueError:
+        raise ValueError(f"Unknown size: {name}") from None
+    if not 0 <= mines < height * width:
+        raise ValueError(f"Too many mines for the board: {name}")
+    return height, width, mines
+
+
+def run_simulation(sizes, games, workers):
+    """
+    Plays `games` games of every size in `sizes`, a dict from names to
+    (height, width, mines), across `workers` processes, returning the
+    results.
+    """
+    tasks = [(name, size, seed)
+             for name, size in sizes.items() for seed in range(games)]
+    wins = defaultdict(int)
+    guesses = defaultdict(int)
+    moves = defaultdict(list)
+    with multiprocessing.Pool(workers) as pool:
+        for name, won, guessed, records in pool.imap_unordered(
+            play_game, tasks, chunksize=max(1, len(tasks) // (4 * workers))
+        ):
+            wins[name] += won
+            guesses[name] += guessed
+            moves[name].extend(records)
+
+    return {
+        "games": games,
+        "sizes": {name: {
+            "height": height,
+            "width": width,
+            "mines": mines,
+            "games": games,
+            "wins": wins[name],
+            "win_rate": wins[name] / games if games else 0,
+            "guesses_per_game": guesses[name] / games if games else 0,
+            **summarize(moves[name])
+        } for name, (height, width, mines) in sizes.items()}
+    }
+
+
+def play_game(task):
+    """
+    Plays one game of the named board size, seeding the placement of
+    mines and the AI's random choices with `seed`.
+    Returns (name, won, guesses, records), where records lists the
+    seconds taken by each move.
+    """
+    name, (height, width, mines), seed = task
+    random.seed(seed)
+    game = Minesweeper(height=height, width=width, mines=mines)
+    ai = MinesweeperAI(height=height, width=width, mines=mines)
+    guesses = 0
+    records = []
+    while True:
+        start = time.perf_counter()
+        move = ai.make_safe_move()
+        if move is None:
+            move = ai.make_random_move()
+            if move is None:
+                records.append(time.perf_counter() - start)
+                return name, ai.mines == game.mines, guesses, records
+            if move not in ai.safes:
+                guesses += 1
+        if game.is_mine(move):
+            records.append(time.perf_counter() - start)
+            return name, False, guesses, records
+        ai.add_knowledge(move, game.nearby_mines(move))
+        records.append(time.perf_counter() - start)
+
+
+def summarize(moves):
+    """
+    Returns the move count and latency percentiles of a list of move
+    durations in seconds.
+    """
+    latencies = sorted(1000 * elapsed for elapsed in moves)
+    return {
+        "moves": len(moves),
+        "latency_ms": {
+            **{f"p{p}": percentile(latencies, p) for p in PERCENTILES},
+            "max": latencies[-1] if latencies else 0
+        }
+    }
+
+
+def percentile(values, p):
+    """
+    Returns the nearest-rank `p`th percentile of sorted `values`.
+    """
+    if not values:
+        return 0
+    return values[max(0, -(-p * len(values) // 100) - 1)]
+
+
+if __name__ == "__main__":
+    main()
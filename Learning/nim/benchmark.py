@@ -0,0 +1,73 @@
+"""
+Benchmarks for Nim Q-learning with and without canonical states.
+
+Trains AIs for increasing numbers of games, and reports the size of
+each Q-learning dictionary, the training time, and how often the
+trained AI picks a winning move in positions that have one.
+
+Usage: python benchmark.py [games ...]
+"""
+
+import contextlib
+import io
+import random
+import sys
+import time
+
+from nim import Nim, after, train, wins
+
+
+def reachable_positions(initial=(1, 3, 5, 7)):
+    """
+    Returns every pile list reachable from `initial`, in pile order.
+    """
+    positions = {initial}
+    stack = [initial]
+    while stack:
+        piles = stack.pop()
+        for pile, count in Nim.available_actions(piles):
+            child = list(piles)
+            child[pile] -= count
+            child = tuple(child)
+            if child not in positions:
+                positions.add(child)
+                stack.append(child)
+    return positions
+
+
+def accuracy(ai, positions):
+    """
+    Returns the fraction of winning positions in which `ai`'s best
+    action leaves its opponent in a losing position.
+    """
+    winning = [piles for piles in positions
+               if any(piles) and wins(tuple(sorted(piles)))]
+    correct = sum(
+        1 for piles in winning
+        if not wins(after(piles, ai.choose_action(list(piles),
+                                                  epsilon=False)))
+    )
+    return correct / len(winning)
+
+
+def main():
+    games = [int(n) for n in sys.argv[1:]] or [1000, 10000, 50000]
+    positions = reachable_positions()
+    print(f"{len(positions)} positions reachable from [1, 3, 5, 7]")
+
+    for n in games:
+        print(f"Training for {n} games")
+        for canonical in (False, True):
+            random.seed(0)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                ai = train(n, canonical=canonical)
+            elapsed = time.perf_counter() - start
+            name = "canonical" if canonical else "plain"
+            print(f"  {name:>9}: {len(ai.q):6d} Q-values "
+                  f"{elapsed:7.2f} s, "
+                  f"winning moves found {100 * accuracy(ai, positions):5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import math
 import random
 import time
+from functools import lru_cache
 
 
 class Nim():
@@ -72,7 +73,7 @@ class Nim():
 
 class NimAI():
 
-    def __init__(self, alpha=0.5, epsilon=0.1):
+    def __init__(self, alpha=0.5, epsilon=0.1, canonical=False):
         """
         Initialize AI with an empty Q-learning dictionary,
         an alpha (learning) rate, and an epsilon rate.
@@ -81,10 +82,41 @@ class NimAI():
         pairs to a Q-value (a number).
          - `state` is a tuple of remaining piles, e.g. (1, 1, 4, 4)
          - `action` is a tuple `(i, j)` for an action
+
+        If `canonical` is True, states that differ only in the order
+        of their piles share Q-values, see `key`.
         """
         self.q = dict()
         self.alpha = alpha
         self.epsilon = epsilon
+        self.canonical = canonical
+
+    def key(self, state, action):
+        """
+        Return the Q-learning dictionary key for `action` in `state`.
+
+        In canonical form the piles are sorted, and the action names
+        the size of the pile it takes from instead of its index, so
+        reordering the piles leaves the key unchanged.
+        """
+        if not self.canonical:
+            return tuple(state), action
+        pile, count = action
+        return tuple(sorted(state)), (state[pile], count)
+
+    def actions(self, state):
+        """
+        Return the available actions in `state`, or in canonical form
+        only one of the actions sharing each key, taking from the
+        first pile of each size.
+        """
+        if not self.canonical:
+            return Nim.available_actions(state)
+        first = {}
+        for i, pile in enumerate(state):
+            first.setdefault(pile, i)
+        return {(i, j) for pile, i in first.items()
+                for j in range(1, pile + 1)}
 
     def update(self, old_state, action, new_state, reward):
         """
@@ -101,9 +133,7 @@ class NimAI():
         Return the Q-value for the state `state` and the action `action`.
         If no Q-value exists yet in `self.q`, return 0.
         """
-        if (tuple(state),action) not in self.q:
-            return 0
-        return self.q[tuple(state),action]
+        return self.q.get(self.key(state, action), 0)
 
     def update_q_value(self, state, action, old_q, reward, future_rewards):
         """
@@ -120,7 +150,7 @@ class NimAI():
         `alpha` is the learning rate, and `new value estimate`
         is the sum of the current reward and estimated future rewards.
         """
-        self.q[tuple(state),action] = old_q + (self.alpha * ((reward + future_rewards) - old_q))
+        self.q[self.key(state, action)] = old_q + (self.alpha * ((reward + future_rewards) - old_q))
         
 
     def best_future_reward(self, state):
@@ -134,9 +164,10 @@ class NimAI():
         `state`, return 0.
         """
         best_reward = 0
-        for action in Nim.available_actions(state):
-            if self.get_q_value(state,action) > best_reward:
-                best_reward = self.get_q_value(state,action)
+        for action in self.actions(state):
+            q_value = self.get_q_value(state,action)
+            if q_value > best_reward:
+                best_reward = q_value
         return best_reward
 
     def choose_action(self, state, epsilon=True):
@@ -156,11 +187,13 @@ class NimAI():
         """
         best_reward = 0
         best_action = None
-        for action in Nim.available_actions(state):
+        actions = self.actions(state)
+        for action in actions:
             if best_action == None:
                 best_action = action
-            if self.get_q_value(state,action) >= best_reward:
-                best_reward = self.get_q_value(state,action)
+            q_value = self.get_q_value(state,action)
+            if q_value >= best_reward:
+                best_reward = q_value
                 best_action = action
         if not epsilon:
             # act = best_action[0]
@@ -170,13 +203,14 @@ class NimAI():
             return best_action
         else:
             weights = []
-            for action in Nim.available_actions(state):
+            actions = list(actions)
+            for action in actions:
                 if action == best_action:
                     weights.append(1-self.epsilon)
                 else:
-                    random_act = len(Nim.available_actions(state))-1
+                    random_act = len(actions)-1
                     weights.append(self.epsilon/random_act)
-            action = random.choices(list(Nim.available_actions(state)),weights=weights,k=1)
+            action = random.choices(actions,weights=weights,k=1)
             act = action[0]
             # print(act)
             # print(act[0])
@@ -184,12 +218,36 @@ class NimAI():
             return act[0], act[1]
 
 
-def train(n):
+@lru_cache(maxsize=None)
+def wins(piles):
+    """
+    Returns True if the player to move wins `piles` with best play.
+    The player who takes the last object loses, so the player to move
+    on empty piles has won.
+    """
+    if not any(piles):
+        return True
+    return any(not wins(after(piles, action))
+               for action in Nim.available_actions(piles))
+
+
+def after(piles, action):
+    """
+    Returns the sorted piles left by taking `action` in `piles`.
+    """
+    pile, count = action
+    piles = list(piles)
+    piles[pile] -= count
+    return tuple(sorted(piles))
+
+
+def train(n, canonical=False):
     """
-    Train an AI by playing `n` games against itself.
+    Train an AI by playing `n` games against itself,
+    sharing Q-values between reordered piles if `canonical`.
     """
 
-    player = NimAI()
+    player = NimAI(canonical=canonical)
 
     # Play n games
     for i in range(n):
@@ -0,0 +1,210 @@
+"""
+Headless tournament between Nim players.
+
+Trains Q-learning AIs, then plays every ordered pairing of the players
+for a number of games each across a pool of processes, and writes each
+pairing's wins and losses and each player's nodes searched and
+per-move latency percentiles as JSON.
+
+Players: random, optimal (exhaustive search of the game), q (a trained
+NimAI) and canonical (a NimAI trained on canonical states).
+
+Usage: python tournament.py [games] [output] [workers] [training]
+"""
+
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+from nim import Nim, after, train, wins
+
+# Latency percentiles to report
+PERCENTILES = [50, 90, 99]
+
+ais = {}
+
+
+def random_player(piles, rng):
+    """
+    Plays a uniformly random action.
+    """
+    return rng.choice(sorted(Nim.available_actions(piles)))
+
+
+def optimal_player(piles, rng):
+    """
+    Plays an action that leaves the opponent losing if there is one,
+    else the smallest action.
+    """
+    actions = sorted(Nim.available_actions(piles))
+    return next((action for action in actions
+                 if not wins(after(piles, action))), actions[0])
+
+
+def q_player(piles, rng):
+    """
+    Plays the best action of the trained NimAI.
+    """
+    return ais["q"].choose_action(piles, epsilon=False)
+
+
+def canonical_player(piles, rng):
+    """
+    Plays the best action of the NimAI trained on canonical states.
+    """
+    return ais["canonical"].choose_action(piles, epsilon=False)
+
+
+# Each player maps piles and a random generator to an action
+PLAYERS = {
+    "random": random_player,
+    "optimal": optimal_player,
+    "q": q_player,
+    "canonical": canonical_player
+}
+
+
+def main():
+    if len(sys.argv) > 5:
+        sys.exit("Usage: python tournament.py "
+                 "[games] [output] [workers] [training]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    output = sys.argv[2] if len(sys.argv) > 2 else "tournament.json"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    training = int(sys.argv[4]) if len(sys.argv) > 4 else 10000
+
+    timings = {}
+    trained = {}
+    for name, canonical in (("q", False), ("canonical", True)):
+        print(f"Training {name} for {training} games...")
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            trained[name] = train(training, canonical=canonical)
+        timings[f"train_{name}"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = run_tournament(list(PLAYERS), games, workers, trained)
+    timings["tournament"] = time.perf_counter() - start
+    results["training"] = training
+    results["timings"] = timings
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for pairing in results["pairings"]:
+        print(f"{pairing['first']:>9} vs {pairing['second']:<9} "
+              f"first wins {pairing['first_wins']:4d}, "
+              f"second wins {pairing['second_wins']:4d}")
+    for name, stats in results["players"].items():
+        latency = stats["latency_ms"]
+        print(f"{name:>9}: {stats['nodes_per_move']:9.1f} nodes/move, "
+              f"p50 {latency['p50']:8.3f} ms, p99 {latency['p99']:8.3f} ms")
+    print(f"Results written to {output}.")
+
+
+def run_tournament(names, games, workers, trained):
+    """
+    Plays `games` games for every ordered pairing of distinct players
+    in `names` across `workers` processes, with the `trained` AIs,
+    returning the results.
+    """
+    tasks = [(first, second, seed)
+             for first in names for second in names if first != second
+             for seed in range(games)]
+    outcomes = defaultdict(lambda: {"first_wins": 0, "second_wins": 0})
+    moves = defaultdict(list)
+    with multiprocessing.Pool(workers, initializer=load_worker,
+                              initargs=(trained,)) as pool:
+        for first, second, winner, records in pool.imap_unordered(
+            play_game, tasks, chunksize=max(1, len(tasks) // (4 * workers))
+        ):
+            key = "first_wins" if winner == 0 else "second_wins"
+            outcomes[first, second][key] += 1
+            moves[first].extend(records[0])
+            moves[second].extend(records[1])
+
+    return {
+        "games": games,
+        "pairings": [{"first": first, "second": second,
+                      **outcomes[first, second]}
+                     for first in names for second in names
+                     if first != second],
+        "players": {name: summarize(moves[name]) for name in names}
+    }
+
+
+def load_worker(trained):
+    """
+    Prepares a worker process with the trained AIs.
+    """
+    ais.update(trained)
+
+
+def nodes():
+    """
+    Returns the number of positions the optimal player in this process
+    has solved since the cache was last cleared.
+    """
+    return wins.cache_info().misses
+
+
+def play_game(task):
+    """
+    Plays one game from the standard piles between the players named
+    `first` and `second`, seeding random choices with `seed`.
+    Returns (first, second, winner, records), where records maps each
+    player number to a list of (nodes, seconds) for its moves.
+    """
+    first, second, seed = task
+    rng = random.Random(seed)
+    players = {0: PLAYERS[first], 1: PLAYERS[second]}
+    records = {0: [], 1: []}
+
+    # Start each game from an empty cache, so searches are measured cold
+    wins.cache_clear()
+    game = Nim()
+    while game.winner is None:
+        side = game.player
+        before = nodes()
+        start = time.perf_counter()
+        action = players[side](game.piles.copy(), rng)
+        elapsed = time.perf_counter() - start
+        records[side].append((nodes() - before, elapsed))
+        game.move(action)
+    return first, second, game.winner, records
+
+
+def summarize(moves):
+    """
+    Returns the move count, nodes searched and latency percentiles
+    of a list of (nodes, seconds) move records.
+    """
+    latencies = sorted(1000 * elapsed for _, elapsed in moves)
+    total = sum(n for n, _ in moves)
+    return {
+        "moves": len(moves),
+        "nodes": total,
+        "nodes_per_move": total / len(moves) if moves else 0,
+        "latency_ms": {
+            **{f"p{p}": percentile(latencies, p) for p in PERCENTILES},
+            "max": latencies[-1] if latencies else 0
+        }
+    }
+
+
+def percentile(values, p):
+    """
+    Returns the nearest-rank `p`th percentile of sorted `values`.
+    """
+    if not values:
+        return 0
+    return values[max(0, -(-p * len(values) // 100) - 1)]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Batch degrees of separation over many pairs of people.
+
+Reads (source, target) pairs from a CSV file with `source` and `target`
+columns, or from a JSON-lines file of {"source": ..., "target": ...}
+objects, where each value is a person id or name. Writes one JSON line
+per pair as searches finish, in completion order.
+
+Usage: python batch.py directory pairs [output] [workers]
+"""
+
+import csv
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+import degrees
+
+
+def main():
+    if not 3 <= len(sys.argv) <= 5:
+        sys.exit("Usage: python batch.py directory pairs [output] [workers]")
+    directory = sys.argv[1]
+    pairs = read_pairs(sys.argv[2])
+    output = sys.argv[3] if len(sys.argv) > 3 else "-"
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else os.cpu_count()
+
+    # Load once up front, so forked workers share the data copy-on-write
+    # and a snapshot exists for any worker that has to load it again
+    print("Loading data...", file=sys.stderr)
+    degrees.load_data(directory)
+    print("Data loaded.", file=sys.stderr)
+
+    f = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        start = time.perf_counter()
+        count = 0
+        for result in run_batch(directory, pairs, workers):
+            f.write(json.dumps(result) + "\n")
+            count += 1
+        f.flush()
+        elapsed = time.perf_counter() - start
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+    print(f"{count} queries in {elapsed:.2f}s "
+          f"({count / elapsed if elapsed else 0:.1f} queries/s).",
+          file=sys.stderr)
+
+
+def read_pairs(path):
+    """
+    Returns the list of (source, target) pairs in a CSV or
+    JSON-lines file.
+    """
+    with open(path, encoding="utf-8") as f:
+        if path.endswith((".jsonl", ".json")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+    return [(row["source"], row["target"]) for row in rows]
+
+
+def run_batch(directory, pairs, workers):
+    """
+    Yields a result dictionary for each (source, target) pair,
+    searching across a pool of `workers` processes.
+    """
+    tasks = []
+    for source, target in pairs:
+        try:
+            tasks.append((source, target,
+                          resolve_person(source), resolve_person(target)))
+        except LookupError as e:
+            yield {"source": source, "target": target, "error": str(e)}
+
+    with multiprocessing.Pool(workers, initializer=load_worker,
+                              initargs=(directory,)) as pool:
+        chunksize = max(1, min(64, len(tasks) // (4 * workers)))
+        yield from pool.imap_unordered(search, tasks, chunksize)
+
+
+def resolve_person(value):
+    """
+    Returns the person id for `value`, which is either a person id
+    or an unambiguous name.
+    Raises LookupError if no single person matches.
+    """
+    if value in degrees.people:
+        return value
+    person_ids = degrees.names.get(value.lower(), set())
+    if len(person_ids) == 1:
+        return next(iter(person_ids))
+    elif not person_ids:
+        raise LookupError(f"person not found: {value}")
+    raise LookupError(f"ambiguous name: {value}")
+
+
+def load_worker(directory):
+    """
+    Loads the data in a worker that did not inherit it from the parent.
+    """
+    if not degrees.people:
+        degrees.load_data(directory)
+
+
+def search(task):
+    """
+    Returns the result dictionary for one resolved pair.
+    """
+    source, target, source_id, target_id = task
+    path = degrees.bidirectional_shortest_path(source_id, target_id)
+    result = {"source": source, "target": target}
+    if path is None:
+        result["degrees"] = None
+    else:
+        result["degrees"] = len(path)
+        result["path"] = path
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmarks for the Degrees search functions.
+
+Usage: python benchmark.py [directory] [pairs]
+"""
+
+import random
+import string
+import sys
+import time
+import tracemalloc
+
+import degrees
+from compact import CompactGraph, load_snapshot, write_snapshot
+from lookup import NameIndex
+
+
+def count_expansions(search, source, target):
+    """
+    Runs `search(source, target)` and returns the path it found,
+    the number of people it expanded and the wall time in seconds.
+    """
+    expanded = 0
+    neighbors_for_person = degrees.neighbors_for_person
+
+    def counting_neighbors(person_id):
+        nonlocal expanded
+        expanded += 1
+        return neighbors_for_person(person_id)
+
+    degrees.neighbors_for_person = counting_neighbors
+    try:
+        start = time.perf_counter()
+        path = search(source, target)
+        elapsed = time.perf_counter() - start
+    finally:
+        degrees.neighbors_for_person = neighbors_for_person
+    return path, expanded, elapsed
+
+
+def benchmark_search(pairs):
+    """
+    Compares single-ended and bidirectional BFS over the given
+    (source, target) pairs, checking both find paths of equal length.
+    """
+    searches = [
+        ("bfs", degrees.shortest_path),
+        ("bidirectional", degrees.bidirectional_shortest_path)
+    ]
+    totals = {name: [0, 0.0] for name, _ in searches}
+    for source, target in pairs:
+        lengths = set()
+        for name, search in searches:
+            path, expanded, elapsed = count_expansions(search, source, target)
+            lengths.add(None if path is None else len(path))
+            totals[name][0] += expanded
+            totals[name][1] += elapsed
+        if len(lengths) != 1:
+            sys.exit(f"Path lengths disagree for {source} -> {target}")
+
+    print(f"Search over {len(pairs)} random pairs")
+    for name, (expanded, elapsed) in totals.items():
+        print(f"  {name:>14}: {expanded / len(pairs):10.1f} expanded/query"
+              f"  {1000 * elapsed / len(pairs):10.3f} ms/query")
+
+
+def benchmark_backends(graph, pairs):
+    """
+    Compares query latency of the dict backend in `degrees`
+    with a CompactGraph over the same data, checking that both
+    give the same neighbors and path lengths.
+    """
+    backends = [
+        ("dict", degrees.neighbors_for_person, degrees.shortest_path),
+        ("compact", graph.neighbors_for_person, graph.shortest_path)
+    ]
+    print(f"Backends over {len(pairs)} random pairs")
+    for name, neighbors_for_person, shortest_path in backends:
+        start = time.perf_counter()
+        neighbors = [neighbors_for_person(source) for source, _ in pairs]
+        neighbors_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        paths = [shortest_path(source, target) for source, target in pairs]
+        path_time = time.perf_counter() - start
+
+        print(f"  {name:>14}: "
+              f"{1000 * neighbors_time / len(pairs):10.3f} ms/neighbors"
+              f"  {1000 * path_time / len(pairs):10.3f} ms/path")
+
+        lengths = [None if path is None else len(path) for path in paths]
+        if name == "dict":
+            expected = (neighbors, lengths)
+        elif (neighbors, lengths) != expected:
+            sys.exit(f"{name} backend disagrees with dict backend")
+
+
+def benchmark_names(count, seed=0):
+    """
+    Times exact, prefix and one-typo lookups of random names
+    in a NameIndex over the loaded people.
+    """
+    start = time.perf_counter()
+    index = NameIndex(
+        (person_id, person["name"])
+        for person_id, person in degrees.people.items()
+    )
+    print(f"Name index built in {time.perf_counter() - start:.2f}s.")
+
+    rng = random.Random(seed)
+    queries = []
+    for name in rng.sample(index.names, min(count, len(index.names))):
+        i = rng.randrange(len(name))
+        typo = name[:i] + rng.choice(string.ascii_lowercase) + name[i + 1:]
+        queries.append((name, name[:max(1, len(name) // 2)], typo))
+
+    lookups = [
+        ("exact", lambda query: index.exact(query[0])),
+        ("prefix", lambda query: index.prefix(query[1])),
+        ("fuzzy", lambda query: index.fuzzy(query[2], max_distance=1))
+    ]
+    print(f"Name lookups over {len(queries)} random names")
+    for name, lookup in lookups:
+        start = time.perf_counter()
+        for query in queries:
+            lookup(query)
+        elapsed = time.perf_counter() - start
+        print(f"  {name:>14}: {1000 * elapsed / len(queries):10.3f} ms/lookup")
+
+
+def measure_memory(build):
+    """
+    Returns the result of calling `build()`, the bytes it allocated
+    that are still alive afterwards and the time it took in seconds.
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def random_pairs(count, seed=0):
+    """
+    Returns `count` random (source, target) pairs of person ids.
+    """
+    rng = random.Random(seed)
+    person_ids = sorted(degrees.people)
+    return [tuple(rng.sample(person_ids, 2)) for _ in range(count)]
+
+
+def main():
+    if len(sys.argv) > 3:
+        sys.exit("Usage: python benchmark.py [directory] [pairs]")
+    directory = sys.argv[1] if len(sys.argv) > 1 else "large"
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    _, size, elapsed = measure_memory(
+        lambda: degrees.load_data(directory, snapshot=False)
+    )
+    print(f"Dict backend loaded in {elapsed:.2f}s, "
+          f"{size / 2 ** 20:.1f} MiB.")
+    graph, size, elapsed = measure_memory(
+        lambda: CompactGraph.from_csv(directory)
+    )
+    print(f"Compact backend loaded in {elapsed:.2f}s, "
+          f"{size / 2 ** 20:.1f} MiB.")
+
+    write_snapshot(graph, directory)
+    start = time.perf_counter()
+    load_snapshot(directory)
+    print(f"Snapshot loaded in {time.perf_counter() - start:.3f}s.")
+
+    pairs = random_pairs(count)
+    benchmark_search(pairs)
+    benchmark_backends(graph, pairs)
+    benchmark_names(count)
+
+
+if __name__ == "__main__":
+    main()
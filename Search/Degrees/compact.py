@@ -0,0 +1,507 @@
+"""
+Compact integer-indexed storage for the Degrees people/movies graph.
+
+People and movies are numbered densely in sorted id order, and the
+person-movie bipartite graph is stored CSR-style: for person `p`, the
+movies they starred in are `person_movies[person_offsets[p]:
+person_offsets[p + 1]]`, and likewise for the stars of each movie.
+"""
+
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections.abc import Mapping
+
+# Identifies the snapshot file layout; bump when it changes
+SNAPSHOT_MAGIC = b"DEGREES1"
+SNAPSHOT_NAME = "degrees.snapshot"
+SOURCES = ["people.csv", "movies.csv", "stars.csv"]
+
+
+class StringTable():
+    """
+    Sequence of strings packed into one UTF-8 blob, where string `i`
+    is `blob[offsets[i]:offsets[i + 1]]`.
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_strings(cls, strings):
+        offsets = array("q", [0])
+        parts = []
+        position = 0
+        for string in strings:
+            encoded = string.encode("utf-8")
+            parts.append(encoded)
+            position += len(encoded)
+            offsets.append(position)
+        return cls(offsets, b"".join(parts))
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def index(self, string):
+        """
+        Returns the position of `string` in a sorted table.
+        Raises KeyError if it is not present.
+        """
+        i = bisect_left(self, string)
+        if i < len(self) and self[i] == string:
+            return i
+        raise KeyError(string)
+
+
+class CompactGraph():
+    """
+    Degrees dataset with dense integer ids and CSR adjacency arrays.
+    """
+
+    # Integer arrays and string tables making up a graph, in snapshot order
+    ARRAYS = ["person_offsets", "person_movies", "movie_offsets",
+              "movie_stars", "name_order"]
+    TABLES = ["person_ids", "names", "births", "movie_ids", "titles", "years"]
+
+    def __init__(self, person_ids, names, births, person_offsets,
+                 person_movies, movie_ids, titles, years, movie_offsets,
+                 movie_stars, name_order):
+        self.person_ids = person_ids
+        self.names = names
+        self.births = births
+        self.name_order = name_order
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_ids = movie_ids
+        self.titles = titles
+        self.years = years
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+
+    @classmethod
+    def from_csv(cls, directory):
+        """
+        Builds the graph directly from the CSV files in `directory`.
+        """
+        with open(f"{directory}/people.csv", encoding="utf-8") as f:
+            people = [(row["id"], row["name"], row["birth"])
+                      for row in csv.DictReader(f)]
+        with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+            movies = [(row["id"], row["title"], row["year"])
+                      for row in csv.DictReader(f)]
+        with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+            stars = [(row["person_id"], row["movie_id"])
+                     for row in csv.DictReader(f)]
+        return cls.build(people, movies, stars)
+
+    @classmethod
+    def from_dicts(cls, people, movies):
+        """
+        Builds the graph from the `people` and `movies` dictionaries
+        filled in by `degrees.load_data`.
+        """
+        return cls.build(
+            [(person_id, person["name"], person["birth"])
+             for person_id, person in people.items()],
+            [(movie_id, movie["title"], movie["year"])
+             for movie_id, movie in movies.items()],
+            [(person_id, movie_id)
+             for person_id, person in people.items()
+             for movie_id in person["movies"]]
+        )
+
+    @classmethod
+    def build(cls, people, movies, stars):
+        """
+        Builds the graph from (id, name, birth) people rows,
+        (id, title, year) movie rows and (person_id, movie_id) star rows.
+        Star rows naming an unknown person or movie are ignored.
+        """
+        people = sorted(dict((row[0], row) for row in people).values())
+        movies = sorted(dict((row[0], row) for row in movies).values())
+        person_index = {row[0]: i for i, row in enumerate(people)}
+        movie_index = {row[0]: i for i, row in enumerate(movies)}
+
+        # Encode each edge as one integer so sorting groups it by person
+        edges = set()
+        for person_id, movie_id in stars:
+            try:
+                edges.add(person_index[person_id] * len(movies)
+                          + movie_index[movie_id])
+            except KeyError:
+                pass
+        edges = sorted(edges)
+
+        person_offsets = array("i", bytes(4 * (len(people) + 1)))
+        person_movies = array("i", bytes(4 * len(edges)))
+        movie_offsets = array("i", bytes(4 * (len(movies) + 1)))
+        for i, edge in enumerate(edges):
+            person, movie = divmod(edge, len(movies))
+            person_offsets[person + 1] += 1
+            movie_offsets[movie + 1] += 1
+            person_movies[i] = movie
+        for i in range(len(people)):
+            person_offsets[i + 1] += person_offsets[i]
+        for i in range(len(movies)):
+            movie_offsets[i + 1] += movie_offsets[i]
+
+        # Counting sort the same edges into per-movie star lists
+        movie_stars = array("i", bytes(4 * len(edges)))
+        position = movie_offsets[:-1]
+        for person in range(len(people)):
+            for j in range(person_offsets[person], person_offsets[person + 1]):
+                movie = person_movies[j]
+                movie_stars[position[movie]] = person
+                position[movie] += 1
+
+        # People sorted by lowercase name, for name lookups
+        name_order = array("i", sorted(
+            range(len(people)), key=lambda person: people[person][1].lower()
+        ))
+
+        return cls(
+            StringTable.from_strings(row[0] for row in people),
+            StringTable.from_strings(row[1] for row in people),
+            StringTable.from_strings(row[2] for row in people),
+            person_offsets,
+            person_movies,
+            StringTable.from_strings(row[0] for row in movies),
+            StringTable.from_strings(row[1] for row in movies),
+            StringTable.from_strings(row[2] for row in movies),
+            movie_offsets,
+            movie_stars,
+            name_order
+        )
+
+    @classmethod
+    def load(cls, path, stamp=None):
+        """
+        Memory-maps a snapshot written by `save`.
+        Returns None if the file is missing, truncated or corrupt, has
+        another layout, or `stamp` is given and differs from the stamp
+        it was saved with.
+        """
+        try:
+            with open(path, "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        view = memoryview(buffer)
+
+        # A truncated or corrupt file fails one of these checks rather
+        # than loading, so the caller can parse the CSV files instead
+        try:
+            if bytes(view[:len(SNAPSHOT_MAGIC)]) != SNAPSHOT_MAGIC:
+                return None
+            start = len(SNAPSHOT_MAGIC) + 8
+            length, = struct.unpack("<Q", view[len(SNAPSHOT_MAGIC):start])
+            if start + length > len(view):
+                return None
+            header = json.loads(bytes(view[start:start + length]))
+            if header["byteorder"] != sys.byteorder or (
+                stamp is not None and header["stamp"] != stamp
+            ):
+                return None
+
+            base = align(start + length)
+            fields = {}
+            for name, (typecode, offset, size) in header["fields"].items():
+                if offset < 0 or size < 0 or base + offset + size > len(view):
+                    return None
+                field = view[base + offset:base + offset + size]
+                fields[name] = (field if typecode == "B"
+                                else field.cast(typecode))
+            arguments = {name: fields[name] for name in cls.ARRAYS}
+            for name in cls.TABLES:
+                arguments[name] = StringTable(
+                    fields[f"{name}_offsets"], fields[f"{name}_blob"]
+                )
+        except (json.JSONDecodeError, struct.error, KeyError, ValueError,
+                TypeError):
+            return None
+        graph = cls(**arguments)
+        graph.buffer = buffer
+        return graph
+
+    def save(self, path, stamp=None):
+        """
+        Writes the graph to a snapshot file that `load` can memory-map,
+        recording `stamp` so stale snapshots can be detected.
+        """
+        buffers = {name: getattr(self, name) for name in self.ARRAYS}
+        for name in self.TABLES:
+            table = getattr(self, name)
+            buffers[f"{name}_offsets"] = table.offsets
+            buffers[f"{name}_blob"] = table.blob
+
+        # Lay each field out at an 8-byte aligned offset
+        fields = {}
+        offset = 0
+        for name, buffer in buffers.items():
+            buffer = memoryview(buffer)
+            fields[name] = (buffer.format, offset, buffer.nbytes)
+            offset = align(offset + buffer.nbytes)
+        header = json.dumps({
+            "byteorder": sys.byteorder,
+            "stamp": stamp,
+            "fields": fields
+        }).encode("utf-8")
+
+        # Write to a temporary file first so readers never see half a file
+        temporary = f"{path}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            base = align(f.tell())
+            for name, buffer in buffers.items():
+                f.write(bytes(base + fields[name][1] - f.tell()))
+                f.write(memoryview(buffer).cast("B"))
+        os.replace(temporary, path)
+
+    def person_index(self, person_id):
+        return self.person_ids.index(person_id)
+
+    def movie_index(self, movie_id):
+        return self.movie_ids.index(movie_id)
+
+    def person_indices_for_name(self, name):
+        """
+        Returns the person indices whose name matches `name`,
+        ignoring case.
+        """
+        name = name.lower()
+        people = []
+        i = bisect_left(self.name_order, name,
+                        key=lambda person: self.names[person].lower())
+        while (i < len(self.name_order)
+               and self.names[self.name_order[i]].lower() == name):
+            people.append(self.name_order[i])
+            i += 1
+        return people
+
+    def movies_of(self, person):
+        """
+        Returns the movie indices a person index starred in.
+        """
+        return self.person_movies[
+            self.person_offsets[person]:self.person_offsets[person + 1]
+        ]
+
+    def stars_of(self, movie):
+        """
+        Returns the person indices that starred in a movie index.
+        """
+        return self.movie_stars[
+            self.movie_offsets[movie]:self.movie_offsets[movie + 1]
+        ]
+
+    def neighbors_for_person(self, person_id):
+        """
+        Returns (movie_id, person_id) pairs for people
+        who starred with a given person.
+        """
+        neighbors = set()
+        for movie in self.movies_of(self.person_index(person_id)):
+            movie_id = self.movie_ids[movie]
+            for person in self.stars_of(movie):
+                neighbors.add((movie_id, self.person_ids[person]))
+        return neighbors
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        source = self.person_index(source)
+        target = self.person_index(target)
+        if source == target:
+            return []
+        parent, via, _ = self.search(source, target)
+        if parent[target] == -1:
+            return None
+        return self.path_to(parent, via, source, target)
+
+    def search(self, source, target=-1):
+        """
+        Runs a breadth-first search from the person index `source`,
+        stopping early once the person index `target` is reached.
+
+        Returns parent, connecting movie and distance arrays indexed by
+        person, holding -1 for people the search did not reach.
+        """
+        parent = array("i", [-1]) * len(self.person_ids)
+        via = array("i", [-1]) * len(self.person_ids)
+        distance = array("h", [-1]) * len(self.person_ids)
+        seen_movies = bytearray(len(self.movie_ids))
+        parent[source] = source
+        distance[source] = 0
+
+        frontier = [source]
+        depth = 0
+        while frontier:
+            depth += 1
+            layer = []
+            for person in frontier:
+                for movie in self.movies_of(person):
+                    if seen_movies[movie]:
+                        continue
+                    seen_movies[movie] = 1
+                    for star in self.stars_of(movie):
+                        if parent[star] != -1:
+                            continue
+                        parent[star] = person
+                        via[star] = movie
+                        distance[star] = depth
+                        if star == target:
+                            return parent, via, distance
+                        layer.append(star)
+            frontier = layer
+        return parent, via, distance
+
+    def path_to(self, parent, via, source, target):
+        """
+        Rebuilds the (movie_id, person_id) path from source to target
+        out of parent and connecting-movie arrays.
+        """
+        path = []
+        person = target
+        while person != source:
+            path.append((self.movie_ids[via[person]], self.person_ids[person]))
+            person = parent[person]
+        path.reverse()
+        return path
+
+
+class PeopleView(Mapping):
+    """
+    Read-only stand-in for the `people` dictionary of `degrees`,
+    backed by a CompactGraph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, person_id):
+        person = self.graph.person_index(person_id)
+        return {
+            "name": self.graph.names[person],
+            "birth": self.graph.births[person],
+            "movies": {self.graph.movie_ids[movie]
+                       for movie in self.graph.movies_of(person)}
+        }
+
+    def __iter__(self):
+        return iter(self.graph.person_ids)
+
+    def __len__(self):
+        return len(self.graph.person_ids)
+
+
+class MoviesView(Mapping):
+    """
+    Read-only stand-in for the `movies` dictionary of `degrees`,
+    backed by a CompactGraph.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, movie_id):
+        movie = self.graph.movie_index(movie_id)
+        return {
+            "title": self.graph.titles[movie],
+            "year": self.graph.years[movie],
+            "stars": {self.graph.person_ids[person]
+                      for person in self.graph.stars_of(movie)}
+        }
+
+    def __iter__(self):
+        return iter(self.graph.movie_ids)
+
+    def __len__(self):
+        return len(self.graph.movie_ids)
+
+
+class NamesView(Mapping):
+    """
+    Read-only stand-in for the `names` dictionary of `degrees`,
+    mapping lowercase names to sets of person ids.
+    """
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __getitem__(self, name):
+        people = self.graph.person_indices_for_name(name)
+        if not people or name != name.lower():
+            raise KeyError(name)
+        return {self.graph.person_ids[person] for person in people}
+
+    def __iter__(self):
+        previous = None
+        for person in self.graph.name_order:
+            name = self.graph.names[person].lower()
+            if name != previous:
+                yield name
+                previous = name
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+def align(offset):
+    """
+    Rounds `offset` up to a multiple of 8 bytes.
+    """
+    return (offset + 7) & ~7
+
+
+def source_stamp(directory):
+    """
+    Returns the sizes and modification times of the CSV files in
+    `directory`, used to tell whether a snapshot is still current.
+    """
+    stamp = {}
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(directory, filename))
+        stamp[filename] = [stat.st_size, stat.st_mtime_ns]
+    return stamp
+
+
+def load_snapshot(directory):
+    """
+    Returns the CompactGraph snapshot of `directory` if there is one
+    and its CSV files have not changed since it was written, else None.
+    """
+    try:
+        stamp = source_stamp(directory)
+    except OSError:
+        return None
+    return CompactGraph.load(os.path.join(directory, SNAPSHOT_NAME), stamp)
+
+
+def write_snapshot(graph, directory):
+    """
+    Saves `graph` as the snapshot of `directory`.
+    Returns False if the snapshot could not be written.
+    """
+    try:
+        graph.save(os.path.join(directory, SNAPSHOT_NAME),
+                   source_stamp(directory))
+    except OSError:
+        return False
+    return True
@@ -1,7 +1,12 @@
 import csv
+import heapq
 import sys
 
-from util import Node, StackFrontier, QueueFrontier
+from compact import (CompactGraph, MoviesView, NamesView, PeopleView,
+                     load_snapshot, write_snapshot)
+from distance import TreeCache
+from lookup import NameIndex, choose_person
+from util import Node, DequeQueueFrontier
 
 # Maps names to a set of corresponding person_ids
 names = {}
@@ -12,11 +17,43 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# CompactGraph behind names, people and movies when loaded from a snapshot
+graph = None
 
-def load_data(directory):
+# CompactGraph copy of the dictionaries, built on demand for source trees
+dict_graph = None
+
+# Recently used shortest-path trees, keyed by source person id
+trees = TreeCache(max_bytes=256 * 2 ** 20)
+
+# NameIndex over everyone's names, built on first use
+name_index = None
+
+
+def load_data(directory, snapshot=True):
     """
     Load data from CSV files into memory.
+
+    If `snapshot` is true, memory-map the binary snapshot left by an
+    earlier run when the CSV files have not changed since, and write
+    a fresh snapshot after parsing them otherwise.
     """
+    global graph, dict_graph, name_index, names, people, movies
+    dict_graph = None
+    name_index = None
+    trees.clear()
+    if snapshot:
+        loaded = load_snapshot(directory)
+        if loaded is not None:
+            graph = loaded
+            names = NamesView(graph)
+            people = PeopleView(graph)
+            movies = MoviesView(graph)
+            return
+    if graph is not None:
+        graph = None
+        names, people, movies = {}, {}, {}
+
     # Load people
     with open(f"{directory}/people.csv", encoding="utf-8") as f:
         reader = csv.DictReader(f)
@@ -51,6 +88,9 @@ def load_data(directory):
             except KeyError:
                 pass
 
+    if snapshot:
+        write_snapshot(CompactGraph.from_dicts(people, movies), directory)
+
 
 def main():
     if len(sys.argv) > 2:
@@ -91,10 +131,12 @@ def shortest_path(source, target):
 
     If no possible path, returns None.
     """
+    if graph is not None:
+        return graph.shortest_path(source, target)
 
     # TODO
     start = Node(state = source, parent = None, action = None)
-    frontier = QueueFrontier()
+    frontier = DequeQueueFrontier()
     frontier.add(start)
     explored = set()
     while True:
@@ -122,17 +164,221 @@ def shortest_path(source, target):
                 frontier.add(child)
 
 
+def bidirectional_shortest_path(source, target):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, searching breadth-first
+    from both ends at once and always growing the smaller frontier.
+
+    If no possible path, returns None.
+    """
+    if source == target:
+        return []
+
+    # Maps each reached person to the (movie_id, person_id) step that
+    # leads back towards the source (forward) or the target (backward)
+    forward = {source: None}
+    backward = {target: None}
+    forward_frontier = [source]
+    backward_frontier = [target]
+
+    while forward_frontier and backward_frontier:
+
+        # Expand one full layer of whichever side is smaller
+        if len(forward_frontier) <= len(backward_frontier):
+            frontier, parents, others = forward_frontier, forward, backward
+        else:
+            frontier, parents, others = backward_frontier, backward, forward
+
+        layer = []
+        for person_id in frontier:
+            for movie_id, neighbor in neighbors_for_person(person_id):
+                if neighbor in parents:
+                    continue
+                parents[neighbor] = (movie_id, person_id)
+                if neighbor in others:
+                    return join_paths(forward, backward, neighbor)
+                layer.append(neighbor)
+
+        if frontier is forward_frontier:
+            forward_frontier = layer
+        else:
+            backward_frontier = layer
+
+    return None
+
+
+def join_paths(forward, backward, meeting):
+    """
+    Returns the (movie_id, person_id) path through `meeting`, given the
+    parent links of a forward and a backward search that both reached it.
+    """
+    path = []
+    person_id = meeting
+    while forward[person_id] is not None:
+        movie_id, parent = forward[person_id]
+        path.append((movie_id, person_id))
+        person_id = parent
+    path.reverse()
+
+    person_id = meeting
+    while backward[person_id] is not None:
+        movie_id, child = backward[person_id]
+        path.append((movie_id, child))
+        person_id = child
+    return path
+
+
+
+def shortest_path_tree(source):
+    """
+    Returns a SourceTree holding the shortest paths from the source
+    to everyone, searching only if the tree is not already cached.
+    """
+    return trees.get(compact_graph(), source)
+
+
+def compact_graph():
+    """
+    Returns the loaded data as a CompactGraph, building a copy of the
+    dictionaries on first use when they were not loaded from a snapshot.
+    """
+    global dict_graph
+    if graph is not None:
+        return graph
+    if dict_graph is None:
+        dict_graph = CompactGraph.from_dicts(people, movies)
+    return dict_graph
+
+
+def cached_shortest_path(source, target):
+    """
+    Returns the same path as `shortest_path`, reusing the cached
+    shortest-path tree of the source across calls.
+    """
+    return shortest_path_tree(source).path(target)
+
+
+def all_shortest_paths(source, target):
+    """
+    Yields every shortest list of (movie_id, person_id) pairs that
+    connects the source to the target, one at a time, so the caller
+    can stop early. Yields nothing if there is no possible path.
+    """
+    if source == target:
+        yield []
+        return
+
+    # Maps each reached person to every (movie_id, person_id) step from
+    # the previous layer that reaches them
+    predecessors = {source: []}
+    frontier = [source]
+    while frontier and target not in predecessors:
+        layer = {}
+        for person_id in frontier:
+            for movie_id, neighbor in neighbors_for_person(person_id):
+                if neighbor in predecessors:
+                    continue
+                layer.setdefault(neighbor, []).append((movie_id, person_id))
+        predecessors.update(layer)
+        frontier = list(layer)
+    if target not in predecessors:
+        return
+
+    # Walk the layers back from the target, one path at a time
+    def paths_to(person_id):
+        if person_id == source:
+            yield []
+            return
+        for movie_id, parent in predecessors[person_id]:
+            for path in paths_to(parent):
+                yield path + [(movie_id, person_id)]
+
+    yield from paths_to(target)
+
+
+def k_shortest_paths(source, target, k=None):
+    """
+    Yields up to `k` (or, if `k` is None, all) simple paths from the
+    source to the target as lists of (movie_id, person_id) pairs,
+    shortest first, using Yen's algorithm.
+    """
+    path = bidirectional_shortest_path(source, target)
+    found = []
+    candidates = []
+    seen = set()
+    while path is not None and (k is None or len(found) < k):
+        yield path
+        found.append(path)
+        seen.add(tuple(path))
+
+        # Branch off each person on the latest path in turn, avoiding
+        # the people before it and the steps already taken from it by
+        # paths sharing the same start
+        people = [source] + [person_id for _, person_id in path]
+        for i in range(len(path)):
+            root = path[:i]
+            banned_steps = {other[i] for other in found
+                            if len(other) > i and other[:i] == root}
+            spur = shortest_path_avoiding(
+                people[i], target, set(people[:i]), banned_steps
+            )
+            if spur is not None and tuple(root + spur) not in seen:
+                seen.add(tuple(root + spur))
+                heapq.heappush(candidates, (i + len(spur), root + spur))
+
+        path = heapq.heappop(candidates)[1] if candidates else None
 
 
-def person_id_for_name(name):
+def shortest_path_avoiding(source, target, banned_people, banned_steps):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs from the
+    source to the target that visits none of `banned_people` and does
+    not start with any of the (movie_id, person_id) `banned_steps`.
+
+    If no possible path, returns None.
+    """
+    parents = {source: None}
+    frontier = [source]
+    while frontier:
+        layer = []
+        for person_id in frontier:
+            for step in neighbors_for_person(person_id):
+                movie_id, neighbor = step
+                if (neighbor in parents or neighbor in banned_people
+                        or person_id == source and step in banned_steps):
+                    continue
+                parents[neighbor] = (movie_id, person_id)
+                if neighbor == target:
+                    path = []
+                    while parents[neighbor] is not None:
+                        movie_id, parent = parents[neighbor]
+                        path.append((movie_id, neighbor))
+                        neighbor = parent
+                    path.reverse()
+                    return path
+                layer.append(neighbor)
+        frontier = layer
+    return None
+
+
+def person_id_for_name(name, policy=None):
     """
     Returns the IMDB id for a person's name,
     resolving ambiguities as needed.
+
+    If `policy` names one of the `lookup.POLICIES`, ambiguities are
+    resolved by that policy instead of asking, and a name with no
+    exact match falls back to the closest names in the name index.
     """
     person_ids = list(names.get(name.lower(), set()))
+    if len(person_ids) == 0 and policy is not None:
+        person_ids = get_name_index().lookup(name)
     if len(person_ids) == 0:
         return None
     elif len(person_ids) > 1:
+        if policy is not None:
+            return choose_person(person_ids, policy, people)
         print(f"Which '{name}'?")
         for person_id in person_ids:
             person = people[person_id]
@@ -150,11 +396,29 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def get_name_index():
+    """
+    Returns the NameIndex over all people, building it on first use.
+    """
+    global name_index
+    if name_index is None:
+        if graph is not None:
+            name_index = NameIndex(zip(graph.person_ids, graph.names))
+        else:
+            name_index = NameIndex(
+                (person_id, person["name"])
+                for person_id, person in people.items()
+            )
+    return name_index
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
     who starred with a given person.
     """
+    if graph is not None:
+        return graph.neighbors_for_person(person_id)
     movie_ids = people[person_id]["movies"]
     neighbors = set()
     for movie_id in movie_ids:
@@ -0,0 +1,149 @@
+"""
+Single-source shortest-path trees for the Degrees graph.
+
+A SourceTree records the result of one full breadth-first search from a
+person, so the path to any target can be rebuilt in time proportional
+to its length. A TreeCache keeps the most recently used trees within a
+memory budget.
+"""
+
+import json
+import struct
+from array import array
+from collections import OrderedDict
+
+# Identifies the saved tree file layout; bump when it changes
+TREE_MAGIC = b"DEGTREE1"
+
+
+class SourceTree():
+    """
+    Parent, connecting movie and distance of every person reachable
+    from one source person in a CompactGraph.
+    """
+
+    def __init__(self, graph, source, parent, via, distance):
+        self.graph = graph
+        self.source = source
+        self.parent = parent
+        self.via = via
+        self.distance = distance
+
+    @classmethod
+    def build(cls, graph, source):
+        """
+        Searches the whole graph from the person id `source`.
+        """
+        parent, via, distance = graph.search(graph.person_index(source))
+        return cls(graph, source, parent, via, distance)
+
+    @property
+    def nbytes(self):
+        """
+        Returns the memory held by the tree's arrays in bytes.
+        """
+        return sum(len(a) * a.itemsize
+                   for a in (self.parent, self.via, self.distance))
+
+    def degrees(self, target):
+        """
+        Returns the degrees of separation between the source and the
+        person id `target`, or None if they are not connected.
+        """
+        distance = self.distance[self.graph.person_index(target)]
+        return None if distance == -1 else distance
+
+    def path(self, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        If no possible path, returns None.
+        """
+        target = self.graph.person_index(target)
+        if self.parent[target] == -1:
+            return None
+        return self.graph.path_to(
+            self.parent, self.via, self.graph.person_index(self.source),
+            target
+        )
+
+    def save(self, path):
+        """
+        Writes the tree to a file that `load` can read back.
+        """
+        header = json.dumps({
+            "source": self.source,
+            "people": len(self.parent)
+        }).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(TREE_MAGIC)
+            f.write(struct.pack("<Q", len(header)))
+            f.write(header)
+            for a in (self.parent, self.via, self.distance):
+                a.tofile(f)
+
+    @classmethod
+    def load(cls, graph, path):
+        """
+        Reads a tree saved by `save` for the same `graph`.
+        """
+        with open(path, "rb") as f:
+            if f.read(len(TREE_MAGIC)) != TREE_MAGIC:
+                raise ValueError(f"{path} is not a saved source tree")
+            length, = struct.unpack("<Q", f.read(8))
+            header = json.loads(f.read(length))
+            if header["people"] != len(graph.person_ids):
+                raise ValueError(f"{path} was saved for a different graph")
+            arrays = []
+            for typecode in ("i", "i", "h"):
+                a = array(typecode)
+                a.fromfile(f, header["people"])
+                arrays.append(a)
+        return cls(graph, header["source"], *arrays)
+
+
+class TreeCache():
+    """
+    Least recently used cache of SourceTrees keyed by source person id,
+    holding at most `max_bytes` of tree arrays.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.trees = OrderedDict()
+        self.nbytes = 0
+
+    def get(self, graph, source):
+        """
+        Returns the tree for `source`, searching `graph` only if
+        it is not already cached.
+        """
+        tree = self.trees.get(source)
+        if tree is not None and tree.graph is graph:
+            self.trees.move_to_end(source)
+            return tree
+        tree = SourceTree.build(graph, source)
+        self.add(tree)
+        return tree
+
+    def add(self, tree):
+        """
+        Caches `tree`, evicting the least recently used trees until
+        the cache fits in its budget again or only `tree` is left.
+        """
+        self.discard(tree.source)
+        self.trees[tree.source] = tree
+        self.nbytes += tree.nbytes
+        while self.nbytes > self.max_bytes and len(self.trees) > 1:
+            _, evicted = self.trees.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def discard(self, source):
+        tree = self.trees.pop(source, None)
+        if tree is not None:
+            self.nbytes -= tree.nbytes
+
+    def clear(self):
+        self.trees.clear()
+        self.nbytes = 0
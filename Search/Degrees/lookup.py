@@ -0,0 +1,212 @@
+"""
+Name lookup for the Degrees dataset: exact, prefix and typo-tolerant
+search over people's names, and non-interactive ways to pick one person
+among several with the same name.
+"""
+
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+
+def most_movies(person):
+    """
+    Ranks people with more movies first, breaking ties by earliest birth.
+    """
+    return (-len(person["movies"]), birth_year(person))
+
+
+def earliest_birth(person):
+    """
+    Ranks people born earlier first, breaking ties by most movies.
+    """
+    return (birth_year(person), -len(person["movies"]))
+
+
+def birth_year(person):
+    """
+    Returns the birth year of a person, or infinity if it is unknown.
+    """
+    birth = person["birth"]
+    return int(birth) if birth.isdigit() else math.inf
+
+
+# Number of trigrams beyond the edit slack whose postings `fuzzy` counts
+# outright before checking the rest candidate by candidate
+COUNTED = 3
+
+# Disambiguation policies, each a sort key over a `people` entry
+POLICIES = {
+    "most_movies": most_movies,
+    "earliest_birth": earliest_birth
+}
+
+
+def choose_person(person_ids, policy, people):
+    """
+    Returns the person id from `person_ids` that ranks first under
+    the named disambiguation `policy`, with ties broken by id.
+    """
+    key = POLICIES[policy]
+    return min(person_ids, key=lambda person_id: (
+        key(people[person_id]), person_id
+    ))
+
+
+class NameIndex():
+    """
+    Sorted array of distinct lowercase names, with a trigram index over
+    them for finding names within a small edit distance of a query.
+    """
+
+    def __init__(self, entries):
+        """
+        Builds the index from (person_id, name) pairs.
+        """
+        ids_by_name = defaultdict(list)
+        for person_id, name in entries:
+            ids_by_name[name.lower()].append(person_id)
+        self.names = sorted(ids_by_name)
+        self.person_ids = [ids_by_name[name] for name in self.names]
+
+        # Maps each (trigram, name length) to the positions of the names
+        # of that length containing the trigram
+        postings = defaultdict(set)
+        for i, name in enumerate(self.names):
+            for trigram in trigrams(name):
+                postings[trigram, len(name)].add(i)
+        self.trigrams = {key: array("i", sorted(positions))
+                         for key, positions in postings.items()}
+
+        # by_length[n] holds the positions of the names of length n
+        self.by_length = [array("i") for _ in range(
+            max(map(len, self.names), default=0) + 1
+        )]
+        for i, name in enumerate(self.names):
+            self.by_length[len(name)].append(i)
+
+    def exact(self, name):
+        """
+        Returns the person ids whose name is `name`, ignoring case.
+        """
+        name = name.lower()
+        i = bisect_left(self.names, name)
+        if i < len(self.names) and self.names[i] == name:
+            return list(self.person_ids[i])
+        return []
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to `limit` (name, person_ids) pairs whose name
+        starts with `prefix`, ignoring case, in alphabetical order.
+        """
+        prefix = prefix.lower()
+        matches = []
+        i = bisect_left(self.names, prefix)
+        while (i < len(self.names) and len(matches) < limit
+               and self.names[i].startswith(prefix)):
+            matches.append((self.names[i], list(self.person_ids[i])))
+            i += 1
+        return matches
+
+    def fuzzy(self, name, max_distance=1, limit=10):
+        """
+        Returns up to `limit` (distance, name, person_ids) triples for
+        names within `max_distance` edits of `name`, closest first.
+        """
+        name = name.lower()
+
+        # Each edit destroys at most three of the query's trigrams, so a
+        # name within `max_distance` edits lacks at most `slack` of them,
+        # and must contain `COUNTED - slack` of the rarest `COUNTED`
+        slack = 3 * max_distance
+        lengths = range(max(len(name) - max_distance, 0),
+                        len(name) + max_distance + 1)
+        query = sorted(trigrams(name), key=lambda trigram: sum(
+            len(self.trigrams.get((trigram, length), ()))
+            for length in lengths
+        ))
+        counted = min(slack + COUNTED, len(query))
+        hits = Counter()
+        for trigram in query[:counted]:
+            for length in lengths:
+                hits.update(self.trigrams.get((trigram, length), ()))
+
+        # A short query may have no more trigrams than edits can destroy,
+        # so a match might share none of them; check every name of a
+        # nearby length then
+        if counted <= slack:
+            for length in lengths:
+                if length < len(self.by_length):
+                    hits.update(dict.fromkeys(self.by_length[length], 0))
+
+        matches = []
+        for i, count in hits.items():
+            misses = counted - count
+            if misses > slack:
+                continue
+            candidate = self.names[i]
+
+            # Check the remaining, more common trigrams by bisection
+            for trigram in query[counted:]:
+                positions = self.trigrams.get((trigram, len(candidate)), ())
+                j = bisect_left(positions, i)
+                if j == len(positions) or positions[j] != i:
+                    misses += 1
+                    if misses > slack:
+                        break
+            if misses > slack:
+                continue
+
+            distance = edit_distance(name, candidate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, candidate, list(self.person_ids[i])))
+        matches.sort()
+        return matches[:limit]
+
+    def lookup(self, name, max_distance=1):
+        """
+        Returns the candidate person ids for `name`: exact matches if
+        there are any, else the closest names within `max_distance`
+        edits, else names starting with `name`.
+        """
+        person_ids = self.exact(name)
+        if person_ids:
+            return person_ids
+        matches = self.fuzzy(name, max_distance)
+        if matches:
+            closest = matches[0][0]
+            return [person_id
+                    for distance, _, ids in matches if distance == closest
+                    for person_id in ids]
+        return [person_id
+                for _, ids in self.prefix(name)
+                for person_id in ids]
+
+
+def trigrams(name):
+    """
+    Returns the set of three-character substrings of `name`,
+    padded so that its first and last characters get trigrams too.
+    """
+    padded = f"  {name} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit):
+    """
+    Returns the Levenshtein distance between `a` and `b`,
+    or `limit + 1` once it is known to exceed `limit`.
+    """
+    previous = list(range(len(b) + 1))
+    for i, x in enumerate(a, 1):
+        current = [i]
+        for j, y in enumerate(b, 1):
+            current.append(min(previous[j] + 1,
+                               current[j - 1] + 1,
+                               previous[j - 1] + (x != y)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
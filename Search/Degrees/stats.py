@@ -0,0 +1,192 @@
+"""
+Graph-wide statistics for the Degrees dataset.
+
+Computes degree distributions, connected components, sampled
+eccentricities and the most central people of the stars graph,
+timing each stage, and writes the results as JSON.
+
+Usage: python stats.py directory [output] [samples]
+"""
+
+import json
+import random
+import sys
+import time
+from array import array
+from collections import Counter
+from contextlib import contextmanager
+
+import degrees
+
+# Number of most central people to report
+TOP = 25
+
+
+def main():
+    if not 2 <= len(sys.argv) <= 4:
+        sys.exit("Usage: python stats.py directory [output] [samples]")
+    directory = sys.argv[1]
+    output = sys.argv[2] if len(sys.argv) > 2 else "stats.json"
+    samples = int(sys.argv[3]) if len(sys.argv) > 3 else 32
+
+    timings = {}
+    results = {"timings": timings}
+
+    with stage("load", timings):
+        degrees.load_data(directory)
+        graph = degrees.compact_graph()
+
+    with stage("degrees", timings):
+        results["degrees"] = degree_distributions(graph)
+
+    with stage("components", timings):
+        components = connected_components(graph)
+        results["components"] = summarize_components(components)
+
+    with stage("sampling", timings):
+        results.update(sample_distances(graph, components, samples))
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}.")
+
+
+@contextmanager
+def stage(name, timings):
+    """
+    Times the enclosed block, recording and printing its duration.
+    """
+    print(f"{name}...")
+    start = time.perf_counter()
+    yield
+    timings[name] = time.perf_counter() - start
+    print(f"{name} done in {timings[name]:.2f}s.")
+
+
+def degree_distributions(graph):
+    """
+    Returns histograms of movies per person, stars per movie and
+    distinct co-stars per person.
+    """
+    people = len(graph.person_ids)
+    movies_per_person = Counter(
+        graph.person_offsets[p + 1] - graph.person_offsets[p]
+        for p in range(people)
+    )
+    stars_per_movie = Counter(
+        graph.movie_offsets[m + 1] - graph.movie_offsets[m]
+        for m in range(len(graph.movie_ids))
+    )
+
+    # Count distinct co-stars, stamping each with the person being counted
+    stamp = array("i", [-1]) * people
+    costars_per_person = Counter()
+    for person in range(people):
+        stamp[person] = person
+        count = 0
+        for movie in graph.movies_of(person):
+            for star in graph.stars_of(movie):
+                if stamp[star] != person:
+                    stamp[star] = person
+                    count += 1
+        costars_per_person[count] += 1
+
+    return {
+        "movies_per_person": histogram(movies_per_person),
+        "stars_per_movie": histogram(stars_per_movie),
+        "costars_per_person": histogram(costars_per_person)
+    }
+
+
+def connected_components(graph):
+    """
+    Returns an array mapping each person index to the root of its
+    connected component, using union-find over each movie's stars.
+    """
+    parent = array("i", range(len(graph.person_ids)))
+    size = array("i", [1]) * len(graph.person_ids)
+
+    def find(person):
+        while parent[person] != person:
+            parent[person] = parent[parent[person]]
+            person = parent[person]
+        return person
+
+    for movie in range(len(graph.movie_ids)):
+        stars = graph.stars_of(movie)
+        if not stars:
+            continue
+        root = find(stars[0])
+        for star in stars[1:]:
+            other = find(star)
+            if other == root:
+                continue
+            if size[other] > size[root]:
+                root, other = other, root
+            parent[other] = root
+            size[root] += size[other]
+
+    return array("i", (find(person) for person in range(len(parent))))
+
+
+def summarize_components(components):
+    """
+    Returns the number of components, the largest sizes and
+    a histogram of component sizes.
+    """
+    sizes = Counter(components)
+    return {
+        "count": len(sizes),
+        "largest": sorted(sizes.values(), reverse=True)[:10],
+        "sizes": histogram(Counter(sizes.values()))
+    }
+
+
+def sample_distances(graph, components, samples, seed=0):
+    """
+    Runs breadth-first searches from random people in the largest
+    component, returning their eccentricities and the people with the
+    smallest mean distance to the sampled sources.
+    """
+    largest, _ = Counter(components).most_common(1)[0]
+    members = [person for person in range(len(components))
+               if components[person] == largest]
+    sources = random.Random(seed).sample(members, min(samples, len(members)))
+
+    # Distances are symmetric, so summing each source's distances to
+    # everyone estimates everyone's mean distance to the whole component
+    totals = array("q", bytes(8 * len(components)))
+    eccentricities = []
+    for source in sources:
+        _, _, distance = graph.search(source)
+        for person in members:
+            totals[person] += distance[person]
+        eccentricities.append({
+            "person_id": graph.person_ids[source],
+            "name": graph.names[source],
+            "eccentricity": max(distance)
+        })
+
+    central = sorted(members, key=lambda person: totals[person])[:TOP]
+    return {
+        "eccentricity_samples": eccentricities,
+        "diameter_lower_bound": max(
+            sample["eccentricity"] for sample in eccentricities
+        ),
+        "most_central": [{
+            "person_id": graph.person_ids[person],
+            "name": graph.names[person],
+            "mean_distance": totals[person] / len(sources)
+        } for person in central]
+    }
+
+
+def histogram(counter):
+    """
+    Returns a Counter as a list of [value, count] pairs sorted by value.
+    """
+    return [[value, counter[value]] for value in sorted(counter)]
+
+
+if __name__ == "__main__":
+    main()
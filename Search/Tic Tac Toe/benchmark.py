@@ -0,0 +1,211 @@
+"""
+Benchmarks for the Tic Tac Toe minimax implementations.
+
+Plays a full game from the empty board with each implementation
+choosing every move, and reports nodes searched and time per move,
+and how long the opening book takes to load. Compares the engine's
+transposition tables with and without symmetric positions sharing
+entries.
+With `check`, also verifies on every reachable position that
+`minimax` picks a move as good as the nested-list search does, both
+through the alpha-beta engine and through the opening book.
+
+Usage: python benchmark.py [check]
+"""
+
+import sys
+import time
+
+import book
+import engine
+import tictactoe as ttt
+
+
+def count_list_nodes():
+    """
+    Wraps the nested-list search so that it counts the positions it
+    visits. Returns a function that reads and resets the count.
+    """
+    count = 0
+
+    def counting(search):
+        def wrapper(board):
+            nonlocal count
+            count += 1
+            return search(board)
+        return wrapper
+
+    ttt.x_player_best = counting(ttt.x_player_best)
+    ttt.o_player_best = counting(ttt.o_player_best)
+
+    def read():
+        nonlocal count
+        nodes, count = count, 0
+        return nodes
+    return read
+
+
+def count_engine_nodes():
+    """
+    Returns the number of positions `engine` searched since last called.
+    """
+    nodes = engine.nodes
+    engine.nodes = 0
+    return nodes
+
+
+def count_no_nodes():
+    """
+    Returns 0, for implementations that do no search.
+    """
+    return 0
+
+
+def count_game_nodes():
+    """
+    Returns the number of positions the configured m,n,k-game
+    searched since last called.
+    """
+    nodes = ttt.game.nodes
+    ttt.game.nodes = 0
+    return nodes
+
+
+def play(minimax, read_nodes):
+    """
+    Plays a game from the empty board with `minimax` choosing every move.
+    Returns a list of (nodes, seconds) for each move.
+    """
+    board = ttt.initial_state()
+    moves = []
+    read_nodes()
+    while not ttt.terminal(board):
+        start = time.perf_counter()
+        action = minimax(board)
+        elapsed = time.perf_counter() - start
+        moves.append((read_nodes(), elapsed))
+        board = ttt.result(board, action)
+    return moves
+
+
+def reachable_positions():
+    """
+    Returns every board reachable from the empty board by legal play.
+    """
+    boards = [ttt.initial_state()]
+    seen = set()
+    for board in boards:
+        if ttt.terminal(board):
+            continue
+        for action in ttt.actions(board):
+            child = ttt.result(board, action)
+            if ttt.bitboards(child) not in seen:
+                seen.add(ttt.bitboards(child))
+                boards.append(child)
+    return boards
+
+
+def check():
+    """
+    Checks on every reachable position that `minimax` chooses a move of
+    the same minimax value as the nested-list search does, both when
+    it searches with the engine, with and without symmetric table
+    entries, and when it reads the opening book.
+    """
+    boards = [board for board in reachable_positions()
+              if not ttt.terminal(board)]
+    saved = ttt.opening_book, engine.symmetric
+    paths = [("alpha-beta", None, False), ("alpha-beta sym", None, True)]
+    stored = book.load()
+    if stored is None:
+        print("No opening book to check; run book.py to build one")
+    else:
+        paths.append(("opening book", stored, True))
+
+    expected = {}
+    for board in boards:
+        x, o = ttt.bitboards(ttt.result(board, ttt.list_minimax(board)))
+        expected[ttt.bitboards(board)] = engine.solve(x, o)
+
+    failed = False
+    for name, stored, symmetric in paths:
+        ttt.opening_book = stored
+        engine.symmetric = symmetric
+        engine.bounds.clear()
+        disagreeing = []
+        for board in boards:
+            x, o = ttt.bitboards(ttt.result(board, ttt.minimax(board)))
+            if engine.solve(x, o) != expected[ttt.bitboards(board)]:
+                disagreeing.append(board)
+        print(f"Checked {len(boards)} positions with {name}: "
+              f"{len(disagreeing)} moves disagree.")
+        if disagreeing:
+            print(f"  First on {disagreeing[0]}")
+            failed = True
+    ttt.opening_book, engine.symmetric = saved
+    if failed:
+        sys.exit("Moves disagree")
+
+
+def report(name, moves):
+    nodes = sum(n for n, _ in moves)
+    elapsed = sum(t for _, t in moves)
+    print(f"  {name:>21}: first move {moves[0][0]:7d} nodes "
+          f"{1000 * moves[0][1]:9.3f} ms, "
+          f"game {nodes:7d} nodes {1000 * elapsed / len(moves):9.3f} ms/move")
+
+
+def main():
+    if len(sys.argv) > 2 or sys.argv[1:] not in ([], ["check"]):
+        sys.exit("Usage: python benchmark.py [check]")
+
+    print("Self-play from the empty board")
+    report("list minimax", play(ttt.list_minimax, count_list_nodes()))
+
+    opening_book, ttt.opening_book = ttt.opening_book, None
+    for symmetric in (False, True):
+        engine.symmetric = symmetric
+        engine.bounds.clear()
+        suffix = " sym" if symmetric else ""
+        report(f"alpha-beta{suffix} (cold)",
+               play(ttt.minimax, count_engine_nodes))
+        report(f"alpha-beta{suffix} (warm)",
+               play(ttt.minimax, count_engine_nodes))
+        print(f"  {'':>21}  {len(engine.bounds)} table entries")
+
+    start = time.perf_counter()
+    ttt.opening_book = book.load()
+    elapsed = time.perf_counter() - start
+    if ttt.opening_book is None:
+        ttt.opening_book = opening_book
+        print("  No opening book; run book.py to build one")
+    else:
+        report("opening book", play(ttt.minimax, count_no_nodes))
+        print(f"  {'':>21}  loaded in {1000 * elapsed:.3f} ms")
+
+    print("Exact solve of the empty board")
+    for symmetric in (False, True):
+        engine.symmetric = symmetric
+        engine.table.clear()
+        start = time.perf_counter()
+        engine.solve(0, 0)
+        elapsed = time.perf_counter() - start
+        name = "symmetric" if symmetric else "plain"
+        print(f"  {name:>21}: {len(engine.table):7d} table entries "
+              f"{1000 * elapsed:9.3f} ms")
+
+    print("Time-limited self-play on larger boards")
+    for rows, columns, k in [(4, 4, 4), (5, 5, 4)]:
+        ttt.configure(rows, columns, k, time_limit=0.2)
+        moves = play(ttt.minimax, count_game_nodes)
+        report(f"{rows},{columns},{k} (0.2 s)", moves)
+        print(f"  {'':>21}  slowest move "
+              f"{1000 * max(elapsed for _, elapsed in moves):.1f} ms")
+    ttt.configure(3, 3, 3)
+
+    if sys.argv[1:] == ["check"]:
+        check()
+
+
+if __name__ == "__main__":
+    main()
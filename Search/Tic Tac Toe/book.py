@@ -0,0 +1,101 @@
+"""
+Perfect-play opening book for Tic Tac Toe.
+
+Solves every reachable position once, keeping one representative of
+each class of positions equal under the board's 8 rotations and
+reflections, and stores the best move and minimax value of each
+representative in one byte of a table indexed by the base-3 encoding
+of the position.
+
+Usage: python book.py [output]
+"""
+
+import os
+import sys
+import time
+
+import engine
+from symmetry import canonical, from_canonical, to_canonical
+
+BOOK_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         "book.bin")
+
+# Cell stored for positions that have no move to make
+NO_MOVE = 15
+
+
+def build():
+    """
+    Returns the book as a bytearray with one entry per base-3 index.
+
+    Only one representative of each symmetry class is expanded, since
+    the children of symmetric positions are themselves symmetric.
+    """
+    book = bytearray(b"\xff") * 3 ** 9
+    positions = [(0, 0)]
+    for x, o in positions:
+        key, s = canonical(x, o)
+        cell = engine.best_move(x, o)
+        stored = NO_MOVE if cell is None else to_canonical(cell, s)
+        book[key] = (engine.solve(x, o) + 1) << 4 | stored
+        if cell is None:
+            continue
+        for cell in range(9):
+            if (x | o) >> cell & 1:
+                continue
+            if engine.x_to_move(x, o):
+                child = (x | 1 << cell, o)
+            else:
+                child = (x, o | 1 << cell)
+            key, _ = canonical(*child)
+            if book[key] == 0xff:
+                # Mark the class as queued until its entry is filled in
+                book[key] = 0xfe
+                positions.append(child)
+    return book
+
+
+def load(path=BOOK_FILE):
+    """
+    Returns the book stored at `path`, or None if there is none.
+    """
+    try:
+        with open(path, "rb") as f:
+            book = f.read()
+    except OSError:
+        return None
+    return book if len(book) == 3 ** 9 else None
+
+
+def lookup(book, x, o):
+    """
+    Returns (cell, value) for the position: an optimal move for the
+    player to move (None if the game is over) and the minimax value.
+    Raises KeyError if the position is not in the book.
+    """
+    key, s = canonical(x, o)
+    entry = book[key]
+    if entry == 0xff:
+        raise KeyError((x, o))
+    cell = entry & 0xf
+    return (None if cell == NO_MOVE else from_canonical(cell, s),
+            (entry >> 4) - 1)
+
+
+def main():
+    if len(sys.argv) > 2:
+        sys.exit("Usage: python book.py [output]")
+    output = sys.argv[1] if len(sys.argv) == 2 else BOOK_FILE
+
+    start = time.perf_counter()
+    book = build()
+    elapsed = time.perf_counter() - start
+    with open(output, "wb") as f:
+        f.write(book)
+    entries = sum(1 for entry in book if entry != 0xff)
+    print(f"Solved {entries} canonical positions in {elapsed:.2f}s, "
+          f"wrote {len(book)} bytes to {output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Bitboard Tic Tac Toe engine.
+
+A position is a pair of 9-bit masks `(x, o)`, one per player, where bit
+`3 * i + j` is set if that player has a mark in row i, column j.
+"""
+
+from symmetry import canonical_key
+
+FULL = 0b111111111
+
+# Masks of the three cells in each row, column and diagonal
+WIN_MASKS = [
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+]
+
+# WINNING[mask] is True if the marks in `mask` complete a line
+WINNING = [any(mask & win == win for win in WIN_MASKS)
+           for mask in range(FULL + 1)]
+
+# Cells in search order: center first, then corners, then edges
+ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+
+# Whether the transposition tables share one entry between positions
+# that are rotations or reflections of each other
+symmetric = True
+
+# Transposition table mapping positions to their minimax value for X
+table = {}
+
+# Transposition table mapping positions to (lower, upper) bounds on
+# their minimax value for X, as proven by alpha-beta searches
+bounds = {}
+
+# Number of positions searched, for benchmarking
+nodes = 0
+
+
+def x_to_move(x, o):
+    """
+    Returns True if X has the next turn in the position.
+    """
+    return x.bit_count() == o.bit_count()
+
+
+def position_key(x, o):
+    """
+    Returns the transposition table key of the position.
+    """
+    if symmetric:
+        return canonical_key(x, o)
+    return x | o << 9
+
+
+def solve(x, o):
+    """
+    Returns the minimax value of the position:
+    1 if X wins with best play, -1 if O wins, 0 for a draw.
+    """
+    global nodes
+    key = position_key(x, o)
+    value = table.get(key)
+    if value is not None:
+        return value
+    nodes += 1
+
+    if WINNING[x]:
+        value = 1
+    elif WINNING[o]:
+        value = -1
+    elif x | o == FULL:
+        value = 0
+    elif x_to_move(x, o):
+        value = max(solve(x | 1 << cell, o)
+                    for cell in range(9) if not (x | o) >> cell & 1)
+    else:
+        value = min(solve(x, o | 1 << cell)
+                    for cell in range(9) if not (x | o) >> cell & 1)
+
+    table[key] = value
+    return value
+
+
+def alphabeta(x, o, alpha=-1, beta=1):
+    """
+    Returns the minimax value of the position for X if it lies strictly
+    between `alpha` and `beta`, else a bound beyond the nearer of them.
+    """
+    global nodes
+    key = position_key(x, o)
+    lower, upper = bounds.get(key, (-1, 1))
+    if lower >= beta:
+        return lower
+    if upper <= alpha or lower == upper:
+        return upper
+    nodes += 1
+
+    if WINNING[x]:
+        value = 1
+    elif WINNING[o]:
+        value = -1
+    elif x | o == FULL:
+        value = 0
+    elif x_to_move(x, o):
+        value = -1
+        a = max(alpha, lower)
+        for cell in ORDER:
+            if (x | o) >> cell & 1:
+                continue
+            value = max(value, alphabeta(x | 1 << cell, o, a, beta))
+            a = max(a, value)
+            if a >= beta:
+                break
+    else:
+        value = 1
+        b = min(beta, upper)
+        for cell in ORDER:
+            if (x | o) >> cell & 1:
+                continue
+            value = min(value, alphabeta(x, o | 1 << cell, alpha, b))
+            b = min(b, value)
+            if alpha >= b:
+                break
+
+    # A value outside the window only bounds the true value
+    if value <= alpha:
+        upper = min(upper, value)
+    elif value >= beta:
+        lower = max(lower, value)
+    else:
+        lower = upper = value
+    bounds[key] = (lower, upper)
+    return value
+
+
+def best_move(x, o):
+    """
+    Returns the cell index of an optimal move for the player to move,
+    or None if the game is over.
+    """
+    if WINNING[x] or WINNING[o] or x | o == FULL:
+        return None
+    x_turn = x_to_move(x, o)
+    best_cell = None
+    best_value = -2
+    for cell in ORDER:
+        if (x | o) >> cell & 1:
+            continue
+
+        # Only a move strictly better than the best so far matters,
+        # so search each child with the window above that value
+        if x_turn:
+            value = alphabeta(x | 1 << cell, o, best_value, 1)
+        else:
+            value = -alphabeta(x, o | 1 << cell, -1, -best_value)
+        if value > best_value:
+            best_cell, best_value = cell, value
+            if best_value == 1:
+                break
+    return best_cell
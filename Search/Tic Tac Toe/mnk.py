@@ -0,0 +1,185 @@
+"""
+m,n,k-game model and time-limited search.
+
+An m,n,k-game is played on an m-row by n-column board, and the first
+player to get k marks in a row, column or diagonal wins. Positions are
+pairs of bitboard masks as in `engine`, with bit `n * i + j` standing
+for row i, column j.
+"""
+
+import time
+
+# Score of a won position, less the number of moves taken to win it
+WIN = 10 ** 9
+
+# Transposition table flags for stored scores
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Number of nodes searched between checks of the clock
+CHECK_EVERY = 1024
+
+
+class SearchTimeout(Exception):
+    """
+    Raised inside a search when its time budget runs out.
+    """
+
+
+class Game():
+    """
+    Rules, heuristic evaluation and iterative-deepening alpha-beta
+    search for one board size and line length.
+    """
+
+    def __init__(self, m, n, k):
+        if not 1 <= k <= max(m, n):
+            raise ValueError("k must fit on the board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.full = (1 << m * n) - 1
+
+        # Every run of k cells in a row, column or diagonal
+        self.lines = []
+        for i in range(m):
+            for j in range(n):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i = i + di * (k - 1)
+                    end_j = j + dj * (k - 1)
+                    if 0 <= end_i < m and 0 <= end_j < n:
+                        self.lines.append(sum(
+                            1 << n * (i + di * step) + j + dj * step
+                            for step in range(k)
+                        ))
+        self.lines_through = [
+            [line for line in self.lines if line >> cell & 1]
+            for cell in range(m * n)
+        ]
+
+        # Try cells nearest the center first
+        self.order = sorted(range(m * n), key=lambda cell: (
+            abs(cell // n - (m - 1) / 2) + abs(cell % n - (n - 1) / 2)
+        ))
+
+        self.table = {}
+        self.nodes = 0
+
+    def wins(self, mask):
+        """
+        Returns True if the marks in `mask` complete a line.
+        """
+        return any(mask & line == line for line in self.lines)
+
+    def wins_through(self, mask, cell):
+        """
+        Returns True if the marks in `mask` complete a line through `cell`.
+        """
+        return any(mask & line == line for line in self.lines_through[cell])
+
+    def evaluate(self, me, them):
+        """
+        Returns a heuristic score of a position for the player to move,
+        rewarding lines that only one player has marks in, more so the
+        more marks they hold.
+        """
+        score = 0
+        for line in self.lines:
+            mine = me & line
+            theirs = them & line
+            if not theirs:
+                score += 4 ** mine.bit_count()
+            elif not mine:
+                score -= 4 ** theirs.bit_count()
+        return score
+
+    def best_move(self, x, o, time_limit):
+        """
+        Returns the cell index of the best move found for the player to
+        move within `time_limit` seconds, or None if the game is over.
+
+        Searches one ply deeper at a time, keeping the move chosen by
+        the deepest search that finished before the deadline.
+        """
+        if self.wins(x) or self.wins(o) or x | o == self.full:
+            return None
+        deadline = time.perf_counter() + time_limit
+        if x.bit_count() == o.bit_count():
+            me, them = x, o
+        else:
+            me, them = o, x
+
+        self.table.clear()
+        empty = (self.full & ~(x | o)).bit_count()
+        best_cell = next(cell for cell in self.order
+                         if not (x | o) >> cell & 1)
+        for depth in range(1, empty + 1):
+            try:
+                score, best_cell = self.search(
+                    me, them, depth, -WIN, WIN, 0, deadline, best_cell
+                )
+            except SearchTimeout:
+                break
+
+            # Stop once the game is solved either way
+            if abs(score) >= WIN - empty:
+                break
+        return best_cell
+
+    def search(self, me, them, depth, alpha, beta, ply, deadline,
+               first=None):
+        """
+        Returns (score, cell) for the player to move, searching `depth`
+        plies with alpha-beta pruning, and trying `first` before the
+        other moves.
+        """
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > deadline:
+            raise SearchTimeout
+        if depth == 0:
+            return self.evaluate(me, them), None
+
+        key = (me, them)
+        entry = self.table.get(key)
+        if entry is not None:
+            entry_depth, score, flag, cell = entry
+            if entry_depth >= depth and (
+                flag == EXACT
+                or flag == LOWER and score >= beta
+                or flag == UPPER and score <= alpha
+            ):
+                return score, cell
+            first = cell if first is None else first
+
+        original_alpha = alpha
+        best_score = -WIN - 1
+        best_cell = None
+        occupied = me | them
+        cells = self.order if first is None else (
+            [first] + [cell for cell in self.order if cell != first]
+        )
+        for cell in cells:
+            if occupied >> cell & 1:
+                continue
+            mine = me | 1 << cell
+            if self.wins_through(mine, cell):
+                score = WIN - ply - 1
+            elif mine | them == self.full:
+                score = 0
+            else:
+                score, _ = self.search(them, mine, depth - 1, -beta, -alpha,
+                                       ply + 1, deadline)
+                score = -score
+            if score > best_score:
+                best_score, best_cell = score, cell
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER
+        elif best_score >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.table[key] = (depth, best_score, flag, best_cell)
+        return best_score, best_cell
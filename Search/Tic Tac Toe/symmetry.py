@@ -0,0 +1,77 @@
+"""
+Symmetries of the Tic Tac Toe board.
+
+The board's 8 rotations and reflections map positions to positions of
+equal value, so tables keyed by position need only store one canonical
+representative of each class: the variant with the smallest index.
+"""
+
+FULL = 0b111111111
+
+# The 8 symmetries of the board, each mapping cell 3 * i + j
+# to the cell it moves to
+SYMMETRIES = [
+    [3 * i + j for i in range(3) for j in range(3)],
+    [3 * j + 2 - i for i in range(3) for j in range(3)],
+    [3 * (2 - i) + 2 - j for i in range(3) for j in range(3)],
+    [3 * (2 - j) + i for i in range(3) for j in range(3)],
+    [3 * i + 2 - j for i in range(3) for j in range(3)],
+    [3 * (2 - i) + j for i in range(3) for j in range(3)],
+    [3 * j + i for i in range(3) for j in range(3)],
+    [3 * (2 - j) + 2 - i for i in range(3) for j in range(3)]
+]
+
+# INVERSES[s][cell] is the cell that symmetry s moves to `cell`
+INVERSES = [[symmetry.index(cell) for cell in range(9)]
+            for symmetry in SYMMETRIES]
+
+# TRANSFORMED[s][mask] is `mask` with every cell moved by symmetry s
+TRANSFORMED = [
+    [sum(1 << symmetry[cell] for cell in range(9) if mask >> cell & 1)
+     for mask in range(FULL + 1)]
+    for symmetry in SYMMETRIES
+]
+
+# TERNARY[mask] is the sum of 3 ** cell over the cells in `mask`
+TERNARY = [sum(3 ** cell for cell in range(9) if mask >> cell & 1)
+           for mask in range(FULL + 1)]
+
+
+def index(x, o):
+    """
+    Returns the base-3 encoding of a position, with digit 1 for X
+    and 2 for O in each cell.
+    """
+    return TERNARY[x] + 2 * TERNARY[o]
+
+
+def canonical(x, o):
+    """
+    Returns (index, symmetry) for the symmetry that maps the position
+    to the smallest index among its 8 variants.
+    """
+    return min((index(transformed[x], transformed[o]), s)
+               for s, transformed in enumerate(TRANSFORMED))
+
+
+def canonical_key(x, o):
+    """
+    Returns the smallest `x | o << 9` key among the position's 8
+    variants, which is cheaper to compute than `canonical`.
+    """
+    return min(transformed[x] | transformed[o] << 9
+               for transformed in TRANSFORMED)
+
+
+def to_canonical(cell, s):
+    """
+    Returns where symmetry s moves `cell`.
+    """
+    return SYMMETRIES[s][cell]
+
+
+def from_canonical(cell, s):
+    """
+    Returns the cell that symmetry s moves to `cell`.
+    """
+    return INVERSES[s][cell]
@@ -5,18 +5,51 @@ Tic Tac Toe Player
 import math
 import copy
 
+import book
+import engine
+import mnk
+
 X = "X"
 O = "O"
 EMPTY = None
 
+# Board rows and columns, and marks in a row needed to win
+ROWS = 3
+COLUMNS = 3
+K = 3
+game = mnk.Game(ROWS, COLUMNS, K)
+
+# Seconds minimax may spend on a move when the game is too big to solve
+TIME_LIMIT = 1.0
+
+# Best move and value of every 3x3 position, or None if not built yet
+opening_book = book.load()
+
+
+def configure(rows, columns, k, time_limit=TIME_LIMIT):
+    """
+    Switches to an m,n,k-game on a `rows` by `columns` board won by
+    `k` marks in a row, where minimax takes up to `time_limit` seconds
+    per move unless the game is the standard 3,3,3 one.
+    """
+    global ROWS, COLUMNS, K, TIME_LIMIT, game
+    game = mnk.Game(rows, columns, k)
+    ROWS, COLUMNS, K = rows, columns, k
+    TIME_LIMIT = time_limit
+
+
+def standard():
+    """
+    Returns True if the game is the standard 3x3 three-in-a-row one.
+    """
+    return (ROWS, COLUMNS, K) == (3, 3, 3)
+
 
 def initial_state():
     """
     Returns starting state of the board.
     """
-    return [[EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY],
-            [EMPTY, EMPTY, EMPTY]]
+    return [[EMPTY] * COLUMNS for _ in range(ROWS)]
 
 
 def player(board):
@@ -25,7 +58,7 @@ def player(board):
     """
     x_count = 0
     o_count = 0
-    for i in range(3):
+    for i in range(len(board)):
         x_count += board[i].count(X)
         o_count += board[i].count(O)
     if(x_count == o_count):
@@ -60,6 +93,13 @@ def winner(board):
     """
     Returns the winner of the game, if there is one.
     """
+    if not standard():
+        x, o = bitboards(board)
+        if game.wins(x):
+            return X
+        elif game.wins(o):
+            return O
+        return None
     for i in range(len(board)):
         if(board[i].count(X)== 3):
             return X
@@ -106,10 +146,41 @@ def utility(board):
         return 0
 
 
+def bitboards(board):
+    """
+    Returns the (x, o) bitboard masks of a board for `engine` and `mnk`.
+    """
+    x = o = 0
+    for i in range(len(board)):
+        for j in range(len(board[i])):
+            if board[i][j] == X:
+                x |= 1 << (len(board[i]) * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (len(board[i]) * i + j)
+    return x, o
+
+
 def minimax(board):
     """
     Returns the optimal action for the current player on the board.
     """
+    if(terminal(board)):
+        return None
+    x, o = bitboards(board)
+    if standard():
+        if opening_book is not None:
+            cell, _ = book.lookup(opening_book, x, o)
+        else:
+            cell = engine.best_move(x, o)
+        return divmod(cell, 3)
+    return divmod(game.best_move(x, o, TIME_LIMIT), COLUMNS)
+
+
+def list_minimax(board):
+    """
+    Returns the optimal action for the current player on the board,
+    searching the nested-list board directly.
+    """
     if(terminal(board)):
         return None
     optimal_move = None
@@ -0,0 +1,227 @@
+"""
+Headless tournament between Tic Tac Toe players.
+
+Plays every ordered pairing of the chosen players for a number of
+games each across a pool of processes, and writes each pairing's wins,
+draws and losses and each player's nodes searched and per-move latency
+percentiles as JSON.
+
+Players: random, list (the nested-list minimax), alphabeta, book and
+mnk (the time-limited m,n,k-game search on the 3x3 board).
+
+Usage: python tournament.py [games] [output] [workers] [players]
+"""
+
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+import book
+import engine
+import mnk
+import tictactoe as ttt
+
+# Seconds the mnk player may spend on a move
+TIME_LIMIT = 0.1
+
+# Latency percentiles to report
+PERCENTILES = [50, 90, 99]
+
+game = mnk.Game(3, 3, 3)
+opening_book = None
+list_nodes = 0
+
+
+def random_player(board, rng):
+    """
+    Plays a uniformly random move.
+    """
+    return rng.choice(sorted(ttt.actions(board)))
+
+
+def list_player(board, rng):
+    """
+    Plays the nested-list minimax move.
+    """
+    return ttt.list_minimax(board)
+
+
+def alphabeta_player(board, rng):
+    """
+    Plays the bitboard alpha-beta move.
+    """
+    return divmod(engine.best_move(*ttt.bitboards(board)), 3)
+
+
+def book_player(board, rng):
+    """
+    Plays the opening book move.
+    """
+    cell, _ = book.lookup(opening_book, *ttt.bitboards(board))
+    return divmod(cell, 3)
+
+
+def mnk_player(board, rng):
+    """
+    Plays the time-limited m,n,k-game search move.
+    """
+    return divmod(game.best_move(*ttt.bitboards(board), TIME_LIMIT), 3)
+
+
+# Each player maps a board and a random generator to an action
+PLAYERS = {
+    "random": random_player,
+    "list": list_player,
+    "alphabeta": alphabeta_player,
+    "book": book_player,
+    "mnk": mnk_player
+}
+
+
+def main():
+    if len(sys.argv) > 5:
+        sys.exit("Usage: python tournament.py "
+                 "[games] [output] [workers] [players]")
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    output = sys.argv[2] if len(sys.argv) > 2 else "tournament.json"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count()
+    names = (sys.argv[4].split(",") if len(sys.argv) > 4
+             else ["random", "alphabeta", "book", "mnk"])
+    for name in names:
+        if name not in PLAYERS:
+            sys.exit(f"Unknown player {name}, choose from "
+                     f"{', '.join(PLAYERS)}")
+    if "book" in names and book.load() is None:
+        sys.exit("No opening book; run book.py to build one")
+
+    start = time.perf_counter()
+    results = run_tournament(names, games, workers)
+    results["seconds"] = time.perf_counter() - start
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    for pairing in results["pairings"]:
+        print(f"{pairing['x']:>9} vs {pairing['o']:<9} "
+              f"X wins {pairing['x_wins']:4d}, draws {pairing['draws']:4d}, "
+              f"O wins {pairing['o_wins']:4d}")
+    for name, stats in results["players"].items():
+        latency = stats["latency_ms"]
+        print(f"{name:>9}: {stats['nodes_per_move']:9.1f} nodes/move, "
+              f"p50 {latency['p50']:8.3f} ms, p99 {latency['p99']:8.3f} ms")
+    print(f"Results written to {output} "
+          f"in {results['seconds']:.2f}s.")
+
+
+def run_tournament(names, games, workers):
+    """
+    Plays `games` games for every ordered pairing of distinct players
+    in `names` across `workers` processes, returning the results.
+    """
+    tasks = [(x, o, seed)
+             for x in names for o in names if x != o
+             for seed in range(games)]
+    outcomes = defaultdict(lambda: {"x_wins": 0, "draws": 0, "o_wins": 0})
+    moves = defaultdict(list)
+    with multiprocessing.Pool(workers, initializer=load_worker) as pool:
+        for x, o, winner, records in pool.imap_unordered(
+            play_game, tasks, chunksize=max(1, len(tasks) // (4 * workers))
+        ):
+            key = "x_wins" if winner == ttt.X else (
+                "o_wins" if winner == ttt.O else "draws")
+            outcomes[x, o][key] += 1
+            moves[x].extend(records[ttt.X])
+            moves[o].extend(records[ttt.O])
+
+    return {
+        "games": games,
+        "pairings": [{"x": x, "o": o, **outcomes[x, o]}
+                     for x in names for o in names if x != o],
+        "players": {name: summarize(moves[name]) for name in names}
+    }
+
+
+def load_worker():
+    """
+    Prepares a worker process: loads the opening book and wraps the
+    nested-list search so that it counts the positions it visits.
+    """
+    global opening_book
+    opening_book = book.load()
+
+    def counting(search):
+        def wrapper(board):
+            global list_nodes
+            list_nodes += 1
+            return search(board)
+        return wrapper
+
+    ttt.x_player_best = counting(ttt.x_player_best)
+    ttt.o_player_best = counting(ttt.o_player_best)
+
+
+def nodes():
+    """
+    Returns the number of positions all players in this process have
+    searched so far.
+    """
+    return engine.nodes + game.nodes + list_nodes
+
+
+def play_game(task):
+    """
+    Plays one game between the players named X and O, seeding random
+    choices with `seed`. Returns (x, o, winner, records), where records
+    maps each side to a list of (nodes, seconds) for its moves.
+    """
+    x, o, seed = task
+    rng = random.Random(seed)
+    players = {ttt.X: PLAYERS[x], ttt.O: PLAYERS[o]}
+    records = {ttt.X: [], ttt.O: []}
+
+    # Start each game from empty tables, so searches are measured cold
+    engine.bounds.clear()
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        side = ttt.player(board)
+        before = nodes()
+        start = time.perf_counter()
+        action = players[side](board, rng)
+        elapsed = time.perf_counter() - start
+        records[side].append((nodes() - before, elapsed))
+        board = ttt.result(board, action)
+    return x, o, ttt.winner(board), records
+
+
+def summarize(moves):
+    """
+    Returns the move count, nodes searched and latency percentiles
+    of a list of (nodes, seconds) move records.
+    """
+    latencies = sorted(1000 * elapsed for _, elapsed in moves)
+    total = sum(n for n, _ in moves)
+    return {
+        "moves": len(moves),
+        "nodes": total,
+        "nodes_per_move": total / len(moves) if moves else 0,
+        "latency_ms": {
+            **{f"p{p}": percentile(latencies, p) for p in PERCENTILES},
+            "max": latencies[-1] if latencies else 0
+        }
+    }
+
+
+def percentile(values, p):
+    """
+    Returns the nearest-rank `p`th percentile of sorted `values`.
+    """
+    if not values:
+        return 0
+    return values[max(0, -(-p * len(values) // 100) - 1)]
+
+
+if __name__ == "__main__":
+    main()